@@ -0,0 +1,293 @@
+"""
+Benchmark suite for the credit risk pipeline
+
+Runs every pipeline stage on synthetic LendingClub-shaped data (see
+src.data.synthetic) and reports wall time, throughput and peak traced
+memory per stage. Results can be stored as a baseline and later runs are
+compared against it, stage by stage, at the same data size.
+
+Usage:
+    python benchmarks/run_benchmarks.py --rows 10000 100000
+    python benchmarks/run_benchmarks.py --rows 1000000 --save-baseline
+    python benchmarks/run_benchmarks.py --rows 1000000 --tolerance 0.2
+
+The exit code is 1 if any stage is slower (or uses more memory) than the
+baseline by more than the tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.basel.risk_weights import (assign_risk_weights, calculate_ead, calculate_pd,
+                                    calculate_rwa, estimate_lgd)
+from src.basel.stress_testing import calculate_stress_metrics
+from src.data.loader import LOAN_SCHEMA, create_target_variable, load_loan_data
+from src.data.preprocessor import (encode_categorical, handle_missing_values, scale_features,
+                                   select_features, split_data)
+from src.data.synthetic import write_synthetic_csv
+from src.models.credit_risk import train_logistic_regression, train_random_forest
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Stress scenario used by the stress and dashboard stages
+SCENARIO = 'severe'
+
+def stage_load(state):
+    state['loans_df'] = load_loan_data(state['csv_path'], schema=LOAN_SCHEMA, chunksize=250000,
+                                       verbose=False)
+    return state['loans_df'].shape[0]
+
+def stage_handle_missing_values(state):
+    features, _ = handle_missing_values(
+        select_features(state['loans_df']),
+        zero_fill_cols=['delinq_2yrs', 'inq_last_6mths', 'pub_rec', 'revol_util',
+                        'open_acc', 'total_acc'],
+        mode_fill_cols=['emp_length'],
+        median_fill_cols=['annual_inc'],
+        group_fill_cols={'dti': 'grade'})
+    state['features'] = features.dropna()
+    return features.shape[0]
+
+def stage_encode_categorical(state):
+    state['encoded'] = encode_categorical(state['features'])
+    return state['encoded'].shape[0]
+
+def stage_scale_features(state):
+    y = create_target_variable(state['loans_df'].loc[state['encoded'].index])
+    X_train, X_test, y_train, y_test = split_data(state['encoded'], y)
+    X_train, X_test, _ = scale_features(X_train, X_test)
+    state.update(X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test)
+    return X_train.shape[0] + X_test.shape[0]
+
+def stage_train_logistic_regression(state):
+    state['model'] = train_logistic_regression(state['X_train'], state['y_train'])
+    return state['X_train'].shape[0]
+
+def stage_train_random_forest(state):
+    train_random_forest(state['X_train'], state['y_train'], n_estimators=50)
+    return state['X_train'].shape[0]
+
+def stage_calculate_pd(state):
+    state['pd'] = np.asarray(calculate_pd(state['model'], state['X_test']))
+    return state['pd'].shape[0]
+
+def stage_risk_weights(state):
+    X_test = state['X_test']
+    lgd = np.broadcast_to(estimate_lgd(X_test), state['pd'].shape).astype(np.float64)
+    ead = calculate_ead(X_test, state['loans_df']).to_numpy()
+    risk_weight = assign_risk_weights(state['pd'])
+    state['risk_data'] = pd.DataFrame({
+        'PD': state['pd'],
+        'LGD': lgd,
+        'EAD': ead,
+        'EL': state['pd'] * lgd * ead,
+        'RiskWeight': risk_weight,
+        'RWA': calculate_rwa(ead, risk_weight)
+    })
+    return state['pd'].shape[0]
+
+def stage_stress_metrics(state):
+    risk_data = state['risk_data']
+    calculate_stress_metrics(risk_data, risk_data['PD'].to_numpy(), risk_data['LGD'].to_numpy(),
+                             risk_data['EAD'].to_numpy(), scenario=SCENARIO)
+    return risk_data.shape[0]
+
+def stage_dashboard_callback(state):
+    from src.visualization.dashboard import compute_scenario_metrics
+
+    compute_scenario_metrics(state['risk_data'], SCENARIO)
+    return state['risk_data'].shape[0]
+
+STAGES = {
+    'load': stage_load,
+    'handle_missing_values': stage_handle_missing_values,
+    'encode_categorical': stage_encode_categorical,
+    'scale_features': stage_scale_features,
+    'train_logistic_regression': stage_train_logistic_regression,
+    'train_random_forest': stage_train_random_forest,
+    'calculate_pd': stage_calculate_pd,
+    'risk_weights': stage_risk_weights,
+    'stress_metrics': stage_stress_metrics,
+    'dashboard_callback': stage_dashboard_callback
+}
+
+def run_stage(func, state, repeat=1, measure_memory=True):
+    """
+    Time a stage (best of repeat runs), then trace its peak memory in one more run
+
+    Parameters:
+    -----------
+    func : callable
+        Stage function taking the shared state dict and returning rows processed
+    state : dict
+        Shared pipeline state
+    repeat : int
+        Number of timed runs
+    measure_memory : bool
+        Run the stage once more under tracemalloc
+
+    Returns:
+    --------
+    dict
+        Rows, seconds, rows per second and peak memory (MB)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_rows = func(state)
+        times.append(time.perf_counter() - start)
+    seconds = min(times)
+
+    peak_mb = np.nan
+    if measure_memory:
+        # Separate run: tracing slows Python-heavy code and would skew the timings
+        tracemalloc.start()
+        func(state)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+
+    return {'rows': n_rows, 'seconds': seconds, 'rows_per_sec': n_rows / seconds,
+            'peak_mb': peak_mb}
+
+def run_benchmarks(n_rows, stages=None, repeat=1, measure_memory=True, random_state=42):
+    """
+    Run the benchmark stages on a synthetic dataset
+
+    Parameters:
+    -----------
+    n_rows : int
+        Number of synthetic loans
+    stages : list, optional
+        Stages to run (defaults to all); earlier stages they depend on run anyway
+    repeat : int
+        Number of timed runs per stage
+    measure_memory : bool
+        Record peak traced memory per stage
+    random_state : int
+        Seed of the synthetic data
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per stage
+    """
+    stages = list(STAGES) if stages is None else stages
+    last = max(list(STAGES).index(stage) for stage in stages)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state = {'csv_path': os.path.join(tmp_dir, 'loans.csv')}
+        start = time.perf_counter()
+        write_synthetic_csv(state['csv_path'], n_rows, random_state=random_state)
+        print(f"Generated {n_rows} synthetic loans in {time.perf_counter() - start:.1f}s")
+
+        for name in list(STAGES)[:last + 1]:
+            if name not in stages and name == 'train_random_forest':
+                continue
+            try:
+                result = run_stage(STAGES[name], state, repeat if name in stages else 1,
+                                   measure_memory and name in stages)
+            except ImportError as exc:
+                print(f"Skipping {name}: {exc}")
+                continue
+            if name in stages:
+                rows.append({'stage': name, **result})
+                print(f"{name:<28}{result['seconds']:>10.3f}s{result['rows_per_sec']:>14,.0f} rows/s"
+                      f"{result['peak_mb']:>10.1f} MB")
+    return pd.DataFrame(rows)
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    """
+    Compare stage results with a baseline run at the same data size
+
+    Parameters:
+    -----------
+    results : pandas.DataFrame
+        Output of run_benchmarks
+    baseline : pandas.DataFrame
+        Stored baseline results
+    tolerance : float
+        Allowed relative increase in time or memory before a stage is
+        flagged as a regression
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Results with baseline values, ratios and a regression flag
+    """
+    comparison = results.merge(baseline[['stage', 'seconds', 'peak_mb']], on='stage', how='left',
+                               suffixes=('', '_baseline'))
+    comparison['time_ratio'] = comparison['seconds'] / comparison['seconds_baseline']
+    comparison['memory_ratio'] = comparison['peak_mb'] / comparison['peak_mb_baseline']
+    comparison['regression'] = (comparison['time_ratio'] > 1 + tolerance) | \
+                               (comparison['memory_ratio'] > 1 + tolerance)
+    return comparison
+
+def _environment():
+    import sklearn
+
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'pandas': pd.__version__, 'sklearn': sklearn.__version__,
+            'machine': platform.machine(), 'cpus': os.cpu_count()}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000],
+                        help='Synthetic dataset sizes (10k to 5M rows)')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=None,
+                        help='Stages to benchmark (default: all)')
+    parser.add_argument('--repeat', type=int, default=1, help='Timed runs per stage (best is kept)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip peak memory tracing')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the baseline for their data sizes')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown before flagging a regression')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the synthetic data')
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+
+    regressions = False
+    for n_rows in args.rows:
+        print(f"\n=== {n_rows:,} loans ===")
+        results = run_benchmarks(n_rows, args.stages, args.repeat, not args.no_memory, args.seed)
+        stored = baseline.get('runs', {}).get(str(n_rows))
+        if stored is not None:
+            comparison = compare_to_baseline(results, pd.DataFrame(stored['stages']), args.tolerance)
+            print(f"\nCompared to baseline ({stored['environment']}):")
+            print(comparison[['stage', 'seconds', 'seconds_baseline', 'time_ratio',
+                              'memory_ratio', 'regression']].to_string(index=False))
+            regressions |= bool(comparison['regression'].any())
+        elif not args.save_baseline:
+            print(f"\nNo baseline for {n_rows} rows in {args.baseline}")
+
+        if args.save_baseline:
+            baseline.setdefault('runs', {})[str(n_rows)] = {
+                'environment': _environment(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'stages': results.to_dict(orient='records')
+            }
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as fh:
+            json.dump(baseline, fh, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -11,15 +11,13 @@ import os
 # Add parent directory to path to import modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.basel.stress_testing import apply_stress_scenario
-from src.basel.risk_weights import assign_basel_risk_weight
 from src.visualization.dashboard import (
+    compute_scenario_metrics,
     plot_pd_distribution, 
     compare_pd_distributions, 
     plot_risk_weight_distribution,
     plot_expected_loss_by_risk,
-    plot_capital_requirements,
-    create_risk_metrics_table
+    plot_capital_requirements
 )
 
 # Load preprocessed data
@@ -104,31 +102,20 @@ app.layout = html.Div([
     [Input('scenario-selection', 'value')]
 )
 def update_dashboard(scenario):
-    # Apply selected stress scenario
-    if scenario == 'normal':
-        current_pd = risk_data['PD']
-        current_el = risk_data['EL']
-        current_rwa = risk_data['RWA']
-        current_risk_weight = risk_data['RiskWeight']
-    else:
-        current_pd = apply_stress_scenario(risk_data['PD'], scenario=scenario)
-        current_el = current_pd * risk_data['LGD'] * risk_data['EAD']
-        current_risk_weight = current_pd.apply(assign_basel_risk_weight)
-        current_rwa = risk_data['EAD'] * current_risk_weight
-    
-    # Calculate risk metrics
-    total_exposure = risk_data['EAD'].sum()
-    total_rwa = current_rwa.sum()
-    total_el = current_el.sum()
-    
-    # Create risk metrics table
-    temp_df = risk_data.copy()
-    temp_df['PD'] = current_pd
-    temp_df['EL'] = current_el
-    temp_df['RWA'] = current_rwa
-    temp_df['RiskWeight'] = current_risk_weight
+    # Capital requirement ratios
+    tier1_capital_ratio = 0.06  # 6%
+    total_capital_ratio = 0.08  # 8%
+    conservation_buffer = 0.025  # 2.5%
     
-    metrics_df, risk_summary = create_risk_metrics_table(temp_df)
+    # Apply selected stress scenario and compute risk metrics
+    results = compute_scenario_metrics(risk_data, scenario,
+                                       tier1_ratio=tier1_capital_ratio,
+                                       total_ratio=total_capital_ratio,
+                                       conservation_buffer=conservation_buffer)
+    current_pd = results['pd']
+    current_el = results['el']
+    current_risk_weight = results['risk_weight']
+    metrics_df = results['metrics']
     
     # Format risk metrics table
     risk_metrics = html.Table([
@@ -140,14 +127,9 @@ def update_dashboard(scenario):
         ])
     ])
     
-    # Calculate capital requirements
-    tier1_capital_ratio = 0.06  # 6%
-    total_capital_ratio = 0.08  # 8%
-    conservation_buffer = 0.025  # 2.5%
-    
-    min_tier1_capital = total_rwa * tier1_capital_ratio
-    min_total_capital = total_rwa * total_capital_ratio
-    min_capital_with_buffer = total_rwa * (total_capital_ratio + conservation_buffer)
+    min_tier1_capital = results['min_tier1_capital']
+    min_total_capital = results['min_total_capital']
+    min_capital_with_buffer = results['min_capital_with_buffer']
     
     # Format capital requirements table
     capital_requirements = html.Table([
@@ -14,6 +14,8 @@ def assign_basel_risk_weight(pd_value):
     --------
     float
         Risk weight (as a decimal)
+
+    Use assign_risk_weights for arrays of PDs.
     """
     # Simplified risk weight assignment based on Basel III
     if pd_value <= 0.05:
@@ -25,6 +27,57 @@ def assign_basel_risk_weight(pd_value):
     else:
         return 1.5  # 150% risk weight
 
+# Simplified Basel III risk weight table: upper PD bound of each bucket and
+# the weights of the buckets, with one more weight for PDs above the last bound
+RISK_WEIGHT_THRESHOLDS = (0.05, 0.10, 0.30)
+RISK_WEIGHTS = (0.5, 0.75, 1.0, 1.5)
+
+def assign_risk_weights(pd_values, thresholds=None, weights=None, return_buckets=False):
+    """
+    Assign risk weights to a whole array of PDs in one pass
+
+    Vectorized equivalent of assign_basel_risk_weight: each PD goes to the
+    first bucket whose upper bound it does not exceed, found by a binary
+    search over the thresholds.
+
+    Parameters:
+    -----------
+    pd_values : numpy.ndarray or pandas.Series
+        Probabilities of default
+    thresholds : sequence, optional
+        Increasing upper PD bounds of the buckets (defaults to
+        RISK_WEIGHT_THRESHOLDS)
+    weights : sequence, optional
+        Risk weight per bucket, one more than thresholds (defaults to
+        RISK_WEIGHTS)
+    return_buckets : bool
+        Also return the bucket index of each PD, e.g. for aggregation
+
+    Returns:
+    --------
+    numpy.ndarray or pandas.Series
+        Risk weights (as decimals), a Series with the input index for
+        Series input
+    numpy.ndarray
+        Bucket indices (int8), only if return_buckets is True
+    """
+    thresholds = np.asarray(RISK_WEIGHT_THRESHOLDS if thresholds is None else thresholds, dtype=np.float64)
+    weights = np.asarray(RISK_WEIGHTS if weights is None else weights, dtype=np.float64)
+    if weights.shape[0] != thresholds.shape[0] + 1:
+        raise ValueError("weights must have one more entry than thresholds")
+    if np.any(np.diff(thresholds) <= 0):
+        raise ValueError("thresholds must be strictly increasing")
+
+    # side='left' puts a PD equal to a bound in that bound's bucket (pd <= bound)
+    buckets = np.searchsorted(thresholds, np.asarray(pd_values), side='left').astype(np.int8)
+    risk_weight = weights[buckets]
+    if isinstance(pd_values, pd.Series):
+        risk_weight = pd.Series(risk_weight, index=pd_values.index, name=pd_values.name)
+
+    if return_buckets:
+        return risk_weight, buckets
+    return risk_weight
+
 def calculate_pd(model, data):
     """
     Calculate probability of default
@@ -32,7 +85,8 @@ def calculate_pd(model, data):
     Parameters:
     -----------
     model : object
-        Trained model with predict_proba method
+        Trained model with predict_proba method, or a compiled scorer with
+        a predict_pd method (see src.models.scoring)
     data : pandas.DataFrame
         Data to calculate PD for
         
@@ -41,6 +95,8 @@ def calculate_pd(model, data):
     numpy.ndarray
         Probability of default
     """
+    if hasattr(model, 'predict_pd'):
+        return model.predict_pd(data)
     return model.predict_proba(data)[:, 1]
 
 def estimate_lgd(loan_data):
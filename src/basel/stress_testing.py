@@ -1,6 +1,13 @@
 import numpy as np
 import pandas as pd
 
+# PD multiplier of the named stress scenarios
+STRESS_SCENARIOS = {
+    'mild': 1.5,       # 50% increase in defaults
+    'moderate': 2.0,   # Double defaults
+    'severe': 3.0      # Triple defaults
+}
+
 def apply_stress_scenario(base_pd, scenario='moderate'):
     """
     Apply stress scenario to probability of default
@@ -9,21 +16,18 @@ def apply_stress_scenario(base_pd, scenario='moderate'):
     -----------
     base_pd : numpy.ndarray
         Base probability of default
-    scenario : str
-        Stress scenario ('mild', 'moderate', 'severe')
+    scenario : str or float
+        Stress scenario ('mild', 'moderate', 'severe') or a PD multiplier
         
     Returns:
     --------
     numpy.ndarray
         Stressed probability of default
     """
-    scenarios = {
-        'mild': 1.5,       # 50% increase in defaults
-        'moderate': 2.0,   # Double defaults
-        'severe': 3.0      # Triple defaults
-    }
-    
-    multiplier = scenarios.get(scenario, 1.0)
+    if isinstance(scenario, (int, float, np.number)):
+        multiplier = scenario
+    else:
+        multiplier = STRESS_SCENARIOS.get(scenario, 1.0)
     stressed_pd = base_pd * multiplier
     
     # Cap at 1.0
@@ -51,14 +55,14 @@ def calculate_stress_metrics(loan_data, base_pd, lgd, ead, scenario='moderate'):
     pandas.DataFrame
         DataFrame with stress metrics
     """
-    from ..basel.risk_weights import assign_basel_risk_weight
+    from ..basel.risk_weights import assign_risk_weights
     
     # Apply stress scenario
     stressed_pd = apply_stress_scenario(base_pd, scenario)
     
     # Calculate stressed metrics
     stressed_el = stressed_pd * lgd * ead
-    stressed_risk_weight = np.array([assign_basel_risk_weight(pd) for pd in stressed_pd])
+    stressed_risk_weight = assign_risk_weights(np.asarray(stressed_pd))
     stressed_rwa = ead * stressed_risk_weight
     
     # Create results DataFrame
@@ -70,6 +74,282 @@ def calculate_stress_metrics(loan_data, base_pd, lgd, ead, scenario='moderate'):
     
     return results
 
+def _scenario_tables(scenarios, segment_codes):
+    """PD/LGD multipliers per scenario and (scenario, category) multiplier tables per segment"""
+    names = list(scenarios)
+    pd_multipliers = np.ones(len(names))
+    lgd_multipliers = np.ones(len(names))
+    # One extra trailing column of ones: missing segment values have code -1
+    # and so pick it up, getting no segment shock
+    tables = {col: np.ones((len(names), len(categories) + 1))
+              for col, (_, categories) in segment_codes.items()}
+
+    for i, name in enumerate(names):
+        spec = scenarios[name]
+        if not isinstance(spec, dict):
+            spec = {'multiplier': spec}
+        pd_multipliers[i] = spec.get('multiplier', 1.0)
+        lgd_multipliers[i] = spec.get('lgd_multiplier', 1.0)
+        for col, shocks in spec.get('segments', {}).items():
+            if col not in tables:
+                raise ValueError(f"Scenario {name} shocks segment {col}, which was not provided")
+            categories = segment_codes[col][1]
+            for category, multiplier in shocks.items():
+                if category not in categories:
+                    raise ValueError(f"Scenario {name} shocks {col}={category!r}, which is not in the data")
+                tables[col][i, categories.get_loc(category)] = multiplier
+    return names, pd_multipliers, lgd_multipliers, tables
+
+def run_stress_scenarios(base_pd, lgd, ead, scenarios=None, segments=None, chunk_size=100000,
+                         return_loan_metrics=False, thresholds=None, weights=None):
+    """
+    Run many stress scenarios in one chunked, broadcasted pass over the loans
+
+    Each scenario multiplies PDs (and optionally LGDs), with optional extra
+    shocks per segment, e.g. by grade or term. For every chunk of loans the
+    stressed PD, EL, risk weight and RWA of all scenarios are computed as one
+    (scenarios x loans) array and reduced to portfolio totals, so the cost is
+    about one pass over the data however many scenarios there are, and the
+    loan frame is never copied.
+
+    Parameters:
+    -----------
+    base_pd : numpy.ndarray
+        Base probability of default
+    lgd : numpy.ndarray or float
+        Loss given default
+    ead : numpy.ndarray
+        Exposure at default
+    scenarios : dict, optional
+        Scenario name to PD multiplier, or to a dict with 'multiplier',
+        'lgd_multiplier' and 'segments' ({column: {category: multiplier}});
+        defaults to STRESS_SCENARIOS. Segment multipliers apply on top of
+        the scenario multiplier.
+    segments : pandas.DataFrame, optional
+        Segment columns (e.g. loan_data[['grade', 'term']]) aligned with base_pd
+    chunk_size : int
+        Loans per chunk
+    return_loan_metrics : bool
+        Also return per-loan (scenarios x loans) float32 arrays
+    thresholds : sequence, optional
+        Risk weight bucket bounds (see assign_risk_weights)
+    weights : sequence, optional
+        Risk weight per bucket (see assign_risk_weights)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        One row per scenario: exposure, EAD-weighted PD, EL, RWA, capital
+        requirements and RWA change against the unstressed portfolio
+    dict
+        Stressed_PD, Stressed_EL, Stressed_RiskWeight and Stressed_RWA
+        arrays, only if return_loan_metrics is True
+    """
+    from ..basel.capital_requirements import calculate_minimum_capital
+    from ..basel.risk_weights import assign_risk_weights
+
+    scenarios = STRESS_SCENARIOS if scenarios is None else scenarios
+    base_pd = np.asarray(base_pd, dtype=np.float64)
+    n_loans = base_pd.shape[0]
+    lgd = np.broadcast_to(np.asarray(lgd, dtype=np.float64), base_pd.shape)
+    ead = np.asarray(ead, dtype=np.float64)
+
+    segment_codes = {}
+    if segments is not None:
+        for col in segments.columns:
+            values = segments[col]
+            categorical = values.astype('category') if values.dtype.name != 'category' else values
+            segment_codes[col] = (categorical.cat.codes.to_numpy(), categorical.cat.categories)
+    names, pd_multipliers, lgd_multipliers, tables = _scenario_tables(scenarios, segment_codes)
+    n_scenarios = len(names)
+
+    totals = {key: np.zeros(n_scenarios) for key in ['pd_exposure', 'el', 'rwa']}
+    base_rwa = 0.0
+    loan_metrics = None
+    if return_loan_metrics:
+        loan_metrics = {key: np.empty((n_scenarios, n_loans), dtype=np.float32)
+                        for key in ['Stressed_PD', 'Stressed_EL', 'Stressed_RiskWeight', 'Stressed_RWA']}
+
+    for start in range(0, n_loans, chunk_size):
+        rows = slice(start, min(start + chunk_size, n_loans))
+        stressed_pd = np.multiply.outer(pd_multipliers, base_pd[rows])
+        for col, table in tables.items():
+            stressed_pd *= table[:, segment_codes[col][0][rows]]
+        np.minimum(stressed_pd, 1.0, out=stressed_pd)
+
+        stressed_lgd = np.minimum(np.multiply.outer(lgd_multipliers, lgd[rows]), 1.0)
+        stressed_el = stressed_lgd
+        stressed_el *= stressed_pd
+        stressed_el *= ead[rows]
+        risk_weight = assign_risk_weights(stressed_pd, thresholds, weights)
+        stressed_rwa = risk_weight * ead[rows]
+
+        totals['pd_exposure'] += stressed_pd @ ead[rows]
+        totals['el'] += stressed_el.sum(axis=1)
+        totals['rwa'] += stressed_rwa.sum(axis=1)
+        base_rwa += np.dot(assign_risk_weights(base_pd[rows], thresholds, weights), ead[rows])
+        if return_loan_metrics:
+            loan_metrics['Stressed_PD'][:, rows] = stressed_pd
+            loan_metrics['Stressed_EL'][:, rows] = stressed_el
+            loan_metrics['Stressed_RiskWeight'][:, rows] = risk_weight
+            loan_metrics['Stressed_RWA'][:, rows] = stressed_rwa
+
+    exposure = ead.sum()
+    capital = calculate_minimum_capital(totals['rwa'])
+    summary = pd.DataFrame({
+        'Scenario': names,
+        'Total Exposure': exposure,
+        'Weighted Avg PD': totals['pd_exposure'] / exposure,
+        'EL': totals['el'],
+        'RWA': totals['rwa'],
+        'Tier 1 Capital': capital['tier1_capital'],
+        'Total Capital': capital['total_capital'],
+        'With Buffer': capital['capital_with_buffer'],
+        'RWA Change (%)': (totals['rwa'] - base_rwa) / base_rwa * 100
+    })
+
+    if return_loan_metrics:
+        return summary, loan_metrics
+    return summary
+
+def _exposure_profile(base_pd, ead):
+    """PDs sorted ascending and the EAD of all loans from each sorted position on"""
+    order = np.argsort(base_pd, kind='stable')
+    sorted_pd = base_pd[order]
+    ead_from = np.concatenate([np.cumsum(ead[order][::-1])[::-1], [0.0]])
+    return sorted_pd, ead_from
+
+def _stressed_rwa(profile, multipliers, thresholds, weights):
+    """
+    RWA of a portfolio with all PDs multiplied by each of the multipliers
+
+    With bucket weights w_0..w_K and bounds t_1..t_K, a loan's risk weight
+    is w_0 + sum_k (w_k - w_(k-1)) [m * PD > t_k], so the RWA is
+    w_0 * EAD + sum_k (w_k - w_(k-1)) * EAD(PD > t_k / m), where the EAD above
+    a PD level is one binary search in the sorted PDs: O(K log n) per
+    multiplier. Stressed PDs are capped at 1.0 (as in apply_stress_scenario),
+    so no exposure ever lies above a bound t_k >= 1.
+    """
+    sorted_pd, ead_from = profile
+    multipliers = np.atleast_1d(np.asarray(multipliers, dtype=np.float64))
+    levels = np.divide.outer(thresholds, multipliers)
+    ead_above = ead_from[np.searchsorted(sorted_pd, levels, side='right')]
+    ead_above[thresholds >= 1.0] = 0.0
+    return weights[0] * ead_from[0] + np.diff(weights) @ ead_above
+
+def _breach_multiplier(rwa_at, available_capital, requirement, max_multiplier, tol):
+    """Bisect for the smallest multiplier at which capital is no longer adequate"""
+    from ..basel.capital_requirements import calculate_minimum_capital, check_capital_adequacy
+
+    def breached(multiplier):
+        required = calculate_minimum_capital(rwa_at(multiplier))[requirement]
+        return not check_capital_adequacy(available_capital, required)
+
+    if breached(1.0):
+        return 1.0
+    if not breached(max_multiplier):
+        return np.inf
+    low, high = 1.0, max_multiplier
+    while high - low > tol * high:
+        middle = (low + high) / 2
+        if breached(middle):
+            high = middle
+        else:
+            low = middle
+    return high
+
+def reverse_stress_test(base_pd, ead, available_capital, requirement='total_capital', segments=None,
+                        max_multiplier=100.0, tol=1e-6, multipliers=None, thresholds=None,
+                        weights=None):
+    """
+    Find the PD multiplier at which available capital stops being adequate
+
+    The portfolio is sorted by PD once, and the RWA under any uniform
+    multiplier m is read from EAD suffix sums at the bucket bounds divided
+    by m (see _stressed_rwa), so each bisection probe costs O(buckets * log n)
+    instead of a full recomputation.
+
+    Parameters:
+    -----------
+    base_pd : numpy.ndarray
+        Base probability of default
+    ead : numpy.ndarray
+        Exposure at default
+    available_capital : float
+        Available capital
+    requirement : str
+        Requirement compared with it: 'tier1_capital', 'total_capital' or
+        'capital_with_buffer' (see calculate_minimum_capital)
+    segments : array-like, optional
+        Segment label per loan (e.g. grade or term); adds the multiplier
+        that breaches when only that segment is stressed
+    max_multiplier : float
+        Largest multiplier searched; np.inf is reported if capital is still
+        adequate there
+    tol : float
+        Relative tolerance of the breach multiplier
+    multipliers : array-like, optional
+        Grid of the capital-vs-multiplier curve (defaults to 1000 points
+        from 1 to twice the breach multiplier, or to max_multiplier)
+    thresholds : sequence, optional
+        Risk weight bucket bounds (defaults to RISK_WEIGHT_THRESHOLDS)
+    weights : sequence, optional
+        Risk weight per bucket (defaults to RISK_WEIGHTS)
+
+    Returns:
+    --------
+    dict
+        multiplier (smallest breaching uniform multiplier, 1.0 if capital is
+        already inadequate), rwa at that multiplier, curve (DataFrame of
+        RWA, required capital and adequacy per multiplier) and, with
+        segments, a DataFrame of per-segment breach multipliers
+    """
+    from ..basel.capital_requirements import calculate_minimum_capital, check_capital_adequacy
+    from ..basel.risk_weights import RISK_WEIGHT_THRESHOLDS, RISK_WEIGHTS
+
+    thresholds = np.asarray(RISK_WEIGHT_THRESHOLDS if thresholds is None else thresholds, dtype=np.float64)
+    weights = np.asarray(RISK_WEIGHTS if weights is None else weights, dtype=np.float64)
+    base_pd = np.asarray(base_pd, dtype=np.float64)
+    ead = np.asarray(ead, dtype=np.float64)
+
+    profile = _exposure_profile(base_pd, ead)
+    multiplier = _breach_multiplier(lambda m: _stressed_rwa(profile, m, thresholds, weights)[0],
+                                    available_capital, requirement, max_multiplier, tol)
+
+    results = {'multiplier': multiplier}
+    if np.isfinite(multiplier):
+        results['rwa'] = _stressed_rwa(profile, multiplier, thresholds, weights)[0]
+
+    if multipliers is None:
+        upper = min(2 * multiplier, max_multiplier) if 1.0 < multiplier < np.inf else max_multiplier
+        multipliers = np.linspace(1.0, upper, 1000)
+    multipliers = np.asarray(multipliers, dtype=np.float64)
+    curve_rwa = _stressed_rwa(profile, multipliers, thresholds, weights)
+    required = calculate_minimum_capital(curve_rwa)[requirement]
+    results['curve'] = pd.DataFrame({
+        'Multiplier': multipliers,
+        'RWA': curve_rwa,
+        'Required Capital': required,
+        'Capital Ratio': available_capital / curve_rwa,
+        'Adequate': check_capital_adequacy(available_capital, required)
+    })
+
+    if segments is not None:
+        labels = pd.Series(np.asarray(segments))
+        base_rwa = _stressed_rwa(profile, 1.0, thresholds, weights)[0]
+        rows = []
+        for label, index in labels.groupby(labels, sort=True).indices.items():
+            segment_profile = _exposure_profile(base_pd[index], ead[index])
+            other_rwa = base_rwa - _stressed_rwa(segment_profile, 1.0, thresholds, weights)[0]
+            segment_multiplier = _breach_multiplier(
+                lambda m: other_rwa + _stressed_rwa(segment_profile, m, thresholds, weights)[0],
+                available_capital, requirement, max_multiplier, tol)
+            rows.append({'Segment': label, 'Loans': len(index), 'Exposure': ead[index].sum(),
+                         'Breach Multiplier': segment_multiplier})
+        results['segments'] = pd.DataFrame(rows)
+
+    return results
+
 def summarize_stress_results(normal_metrics, stressed_metrics):
     """
     Summarize stress test results
@@ -0,0 +1,200 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from .loader import LOAN_SCHEMA, iter_loan_chunks
+
+def file_fingerprint(file_path, hash_content=True, block_size=1 << 20):
+    """
+    Fingerprint a source file by size, modification time and content hash
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the file
+    hash_content : bool
+        Compute the SHA-256 of the file contents (reads the whole file)
+    block_size : int
+        Read block size used for hashing
+
+    Returns:
+    --------
+    dict
+        Dictionary with size, mtime and sha256 (None if not hashed)
+    """
+    stat = os.stat(file_path)
+    digest = None
+    if hash_content:
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as fh:
+            for block in iter(lambda: fh.read(block_size), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': digest}
+
+def _normalize_schema(schema):
+    """Schema with dtypes as strings, JSON-serializable and comparable"""
+    normalized = {}
+    for col, dtype in schema.items():
+        dtype = pd.api.types.pandas_dtype(dtype)
+        # str() of a categorical is just 'category'; repr keeps its categories
+        normalized[col] = repr(dtype) if isinstance(dtype, pd.CategoricalDtype) else str(dtype)
+    return normalized
+
+def _cache_paths(file_path, cache_dir, schema):
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), 'cache')
+    # Full file name plus short hashes of the absolute path and the schema, so
+    # loans.2018Q1.csv and loans.2018Q2.csv (or equal names in other folders)
+    # never share a cache, and each schema keeps its own copy
+    path_hash = hashlib.sha1(os.path.abspath(file_path).encode()).hexdigest()[:8]
+    schema_hash = hashlib.sha1(json.dumps(_normalize_schema(schema), sort_keys=True).encode()).hexdigest()[:8]
+    stem = f"{os.path.basename(file_path)}.{path_hash}.{schema_hash}"
+    return (os.path.join(cache_dir, f"{stem}.parquet"),
+            os.path.join(cache_dir, f"{stem}.meta.json"))
+
+def _read_meta(meta_path):
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as fh:
+        return json.load(fh)
+
+def _write_meta(meta_path, meta):
+    with open(meta_path, 'w') as fh:
+        json.dump(meta, fh, indent=2)
+
+def is_cache_valid(file_path, schema=None, cache_dir=None, verify_hash=False):
+    """
+    Check whether the columnar cache of a source file is up to date
+
+    Size is compared first. If the modification time changed (or verify_hash
+    is set) the content hash decides, so a touched but unchanged file keeps
+    its cache.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source CSV file
+    schema : dict, optional
+        Column/dtype schema the cache was built with (defaults to LOAN_SCHEMA)
+    cache_dir : str, optional
+        Cache directory (defaults to a 'cache' folder next to the source file)
+    verify_hash : bool
+        Always compare content hashes, even if size and mtime match
+
+    Returns:
+    --------
+    bool
+        True if the cache can be used
+    """
+    schema = LOAN_SCHEMA if schema is None else schema
+    cache_path, meta_path = _cache_paths(file_path, cache_dir, schema)
+    meta = _read_meta(meta_path)
+    if meta is None or not os.path.exists(cache_path) or meta['schema'] != _normalize_schema(schema):
+        return False
+
+    current = file_fingerprint(file_path, hash_content=False)
+    if current['size'] != meta['source']['size']:
+        return False
+    if current['mtime'] == meta['source']['mtime'] and not verify_hash:
+        return True
+
+    current = file_fingerprint(file_path)
+    if current['sha256'] != meta['source']['sha256']:
+        return False
+
+    # Same content under a new mtime: refresh the metadata, keep the cache
+    meta['source'] = current
+    _write_meta(meta_path, meta)
+    return True
+
+def build_cache(file_path, schema=None, cache_dir=None, chunksize=250000):
+    """
+    Convert a loan CSV file to a Parquet cache, one row group per chunk
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source CSV file
+    schema : dict, optional
+        Column/dtype schema to cache (defaults to LOAN_SCHEMA)
+    cache_dir : str, optional
+        Cache directory (defaults to a 'cache' folder next to the source file)
+    chunksize : int
+        Rows parsed per chunk while converting
+
+    Returns:
+    --------
+    str
+        Path to the Parquet cache file
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = LOAN_SCHEMA if schema is None else schema
+    cache_path, meta_path = _cache_paths(file_path, cache_dir, schema)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    fingerprint = file_fingerprint(file_path)
+    tmp_path = cache_path + '.tmp'
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in iter_loan_chunks(file_path, schema=schema, chunksize=chunksize, verbose=False):
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                # An all-missing text column in the first chunk must not fix the type to null
+                arrow_schema = pa.schema([
+                    field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                    for field in table.schema
+                ])
+                writer = pq.ParquetWriter(tmp_path, arrow_schema)
+            table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            n_rows += chunk.shape[0]
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, cache_path)
+
+    _write_meta(meta_path, {'source': fingerprint, 'schema': _normalize_schema(schema), 'rows': n_rows})
+    print(f"Cached {n_rows} loans to {cache_path}")
+    return cache_path
+
+def load_cached_loan_data(file_path, columns=None, schema=None, cache_dir=None,
+                          refresh=False, verify_hash=False):
+    """
+    Load loan data from a columnar cache, building it on first use
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the source CSV file
+    columns : list, optional
+        Columns to read (column projection); defaults to all schema columns
+    schema : dict, optional
+        Column/dtype schema to cache (defaults to LOAN_SCHEMA)
+    cache_dir : str, optional
+        Cache directory (defaults to a 'cache' folder next to the source file)
+    refresh : bool
+        Rebuild the cache even if it is valid
+    verify_hash : bool
+        Always compare content hashes when validating the cache
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Loan data
+    """
+    schema = LOAN_SCHEMA if schema is None else schema
+    cache_path, _ = _cache_paths(file_path, cache_dir, schema)
+
+    if refresh or not is_cache_valid(file_path, schema, cache_dir, verify_hash):
+        build_cache(file_path, schema=schema, cache_dir=cache_dir)
+
+    loans_df = pd.read_parquet(cache_path, columns=columns)
+    print(f"Loaded {loans_df.shape[0]} loans with {loans_df.shape[1]} features from cache")
+    return loans_df
@@ -0,0 +1,226 @@
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+# Fixed .npy header size, so the row count can be rewritten in place when
+# rows are appended without moving the data
+_HEADER_SIZE = 128
+
+def preprocessing_fingerprint(*fitted_objects):
+    """
+    Fingerprint the fitted preprocessing state a feature matrix was built with
+
+    Parameters:
+    -----------
+    *fitted_objects : object
+        Fitted imputer, encoder, scaler, ...
+
+    Returns:
+    --------
+    str
+        Hash of the fitted objects
+    """
+    return joblib.hash(fitted_objects)
+
+def _store_paths(path):
+    base = path[:-4] if path.endswith('.npy') else path
+    return base + '.npy', base + '.json'
+
+def _write_header(fh, dtype, shape):
+    header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+              'fortran_order': False,
+              'shape': tuple(shape)}
+    text = repr(header).encode('latin1')
+    preamble = np.lib.format.magic(1, 0) + (_HEADER_SIZE - 10).to_bytes(2, 'little')
+    fh.seek(0)
+    fh.write(preamble + text.ljust(_HEADER_SIZE - 11) + b'\n')
+
+class FeatureStoreWriter:
+    """
+    Append-only writer for a memory-mappable feature matrix
+
+    Rows are written chunk by chunk to a .npy file whose header is updated
+    on close, alongside a JSON sidecar with column names, dtypes and the
+    preprocessing fingerprint.
+
+    Parameters:
+    -----------
+    path : str
+        Store path (the .npy and .json files share this base name)
+    columns : list, optional
+        Column names; taken from the first DataFrame chunk if not given
+    dtype : numpy.dtype
+        Dtype of the stored matrix
+    fingerprint : str, optional
+        Preprocessing fingerprint recorded in the sidecar
+    append : bool
+        Append to an existing store instead of overwriting it
+    """
+
+    def __init__(self, path, columns=None, dtype=np.float32, fingerprint=None, append=False):
+        self.data_path, self.meta_path = _store_paths(path)
+        self.columns = None if columns is None else list(columns)
+        self.dtype = np.dtype(dtype)
+        self.fingerprint = fingerprint
+        self.column_dtypes = None
+        self.n_rows = 0
+        self.n_cols = None if columns is None else len(self.columns)
+        self.ndim = None
+
+        if append and os.path.exists(self.data_path):
+            meta = read_store_meta(path)
+            if fingerprint is not None and meta['fingerprint'] != fingerprint:
+                raise ValueError("Cannot append rows built with a different preprocessing fingerprint")
+            self.columns = meta['columns']
+            self.column_dtypes = meta['column_dtypes']
+            self.dtype = np.dtype(meta['dtype'])
+            self.fingerprint = meta['fingerprint']
+            self.n_rows = meta['shape'][0]
+            self.ndim = len(meta['shape'])
+            self.n_cols = meta['shape'][1] if self.ndim == 2 else None
+            self._fh = open(self.data_path, 'r+b')
+            # Drop any bytes left behind by an aborted append
+            self._fh.seek(_HEADER_SIZE + self.n_rows * self._row_bytes())
+            self._fh.truncate()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(self.data_path)), exist_ok=True)
+            self._fh = open(self.data_path, 'wb')
+            self._fh.write(b'\0' * _HEADER_SIZE)
+        self._initial_rows = self.n_rows
+
+    def _row_bytes(self):
+        return (self.n_cols if self.ndim == 2 else 1) * self.dtype.itemsize
+
+    def write(self, chunk):
+        """Append a DataFrame, Series or array chunk"""
+        if isinstance(chunk, (pd.DataFrame, pd.Series)):
+            if self.column_dtypes is None:
+                dtypes = chunk.dtypes if isinstance(chunk, pd.DataFrame) else pd.Series({chunk.name: chunk.dtype})
+                self.column_dtypes = dtypes.astype(str).tolist()
+            if self.columns is None:
+                self.columns = chunk.columns.tolist() if isinstance(chunk, pd.DataFrame) else [chunk.name]
+        values = np.ascontiguousarray(np.asarray(chunk), dtype=self.dtype)
+        if self.ndim is None:
+            self.ndim = values.ndim
+        if values.ndim == 2 and self.n_cols is None:
+            self.n_cols = values.shape[1]
+        if values.ndim != self.ndim or (values.ndim == 2 and values.shape[1] != self.n_cols):
+            raise ValueError(f"Chunk shape {values.shape} does not match the store layout")
+        self._fh.write(values.tobytes())
+        self.n_rows += values.shape[0]
+
+    def close(self):
+        """Finalize the header and write the sidecar"""
+        if self._fh is None:
+            return
+        shape = (self.n_rows,) if self.ndim == 1 else (self.n_rows, self.n_cols or 0)
+        _write_header(self._fh, self.dtype, shape)
+        self._fh.close()
+        self._fh = None
+
+        meta = {
+            'columns': self.columns,
+            'column_dtypes': self.column_dtypes,
+            'dtype': self.dtype.str,
+            'shape': list(shape),
+            'fingerprint': self.fingerprint
+        }
+        with open(self.meta_path, 'w') as fh:
+            json.dump(meta, fh, indent=2)
+
+    def abort(self):
+        """Discard the rows written since opening and leave the store unchanged"""
+        if self._fh is None:
+            return
+        if self._initial_rows:
+            self._fh.truncate(_HEADER_SIZE + self._initial_rows * self._row_bytes())
+            self._fh.close()
+        else:
+            self._fh.close()
+            os.remove(self.data_path)
+        self._fh = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def save_features(X, path, fingerprint=None, dtype=np.float32, columns=None):
+    """
+    Save a feature matrix or target vector to the feature store
+
+    Parameters:
+    -----------
+    X : pandas.DataFrame, pandas.Series or numpy.ndarray
+        Data to store
+    path : str
+        Store path
+    fingerprint : str, optional
+        Preprocessing fingerprint recorded in the sidecar
+    dtype : numpy.dtype
+        Dtype of the stored matrix
+    columns : list, optional
+        Column names for array input
+    """
+    with FeatureStoreWriter(path, columns=columns, dtype=dtype, fingerprint=fingerprint) as writer:
+        writer.write(X)
+
+def read_store_meta(path):
+    """
+    Read the sidecar of a feature store
+
+    Parameters:
+    -----------
+    path : str
+        Store path
+
+    Returns:
+    --------
+    dict
+        Column names, column dtypes, array dtype, shape and fingerprint
+    """
+    _, meta_path = _store_paths(path)
+    with open(meta_path) as fh:
+        return json.load(fh)
+
+def load_features(path, mmap_mode='r', as_frame=False, fingerprint=None):
+    """
+    Open a feature store, memory-mapped by default
+
+    Parameters:
+    -----------
+    path : str
+        Store path
+    mmap_mode : str, optional
+        np.load mmap mode ('r' for zero-copy read-only); None reads into memory
+    as_frame : bool
+        Wrap the array in a DataFrame (or Series) with the stored column names
+        without copying it
+    fingerprint : str, optional
+        Expected preprocessing fingerprint; a mismatch raises ValueError
+
+    Returns:
+    --------
+    numpy.ndarray, pandas.DataFrame or pandas.Series
+        Stored data
+    """
+    data_path, _ = _store_paths(path)
+    meta = read_store_meta(path)
+    if fingerprint is not None and meta['fingerprint'] != fingerprint:
+        raise ValueError(f"Feature store {data_path} was built with a different preprocessing fingerprint")
+
+    values = np.load(data_path, mmap_mode=mmap_mode)
+    if not as_frame:
+        return values
+    if values.ndim == 1:
+        # Nameless arrays (e.g. targets saved by build_cv_folds) store no columns
+        name = meta['columns'][0] if meta['columns'] else None
+        return pd.Series(values, name=name, copy=False)
+    return pd.DataFrame(values, columns=meta['columns'], copy=False)
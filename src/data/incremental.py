@@ -0,0 +1,186 @@
+import json
+import os
+
+import numpy as np
+
+from .cache import file_fingerprint
+from .feature_store import FeatureStoreWriter, preprocessing_fingerprint
+from .loader import (LOAN_ID_COLUMN, LOAN_ID_SCHEMA, LOAN_SCHEMA, _expand_files,
+                     create_target_variable, load_loan_files)
+from .preprocessor import hash_split_mask, id_hash64, select_features
+
+class LoanManifest:
+    """
+    Record of the source files and loan ids already processed
+
+    Files are tracked by size, mtime and content hash; loan ids by their
+    64-bit hash (see preprocessor.id_hash64), kept sorted for fast lookups.
+
+    Parameters:
+    -----------
+    state_dir : str
+        Directory holding manifest.json and loan_ids.npy
+    """
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        self.files = {}
+        self.id_hashes = np.empty(0, dtype=np.uint64)
+
+    @classmethod
+    def load(cls, state_dir):
+        """Load a manifest, or start an empty one if none exists"""
+        manifest = cls(state_dir)
+        files_path = os.path.join(state_dir, 'manifest.json')
+        ids_path = os.path.join(state_dir, 'loan_ids.npy')
+        if os.path.exists(files_path):
+            with open(files_path) as fh:
+                manifest.files = json.load(fh)
+        if os.path.exists(ids_path):
+            manifest.id_hashes = np.load(ids_path)
+        return manifest
+
+    def save(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        np.save(os.path.join(self.state_dir, 'loan_ids.npy'), self.id_hashes)
+        with open(os.path.join(self.state_dir, 'manifest.json'), 'w') as fh:
+            json.dump(self.files, fh, indent=2)
+
+    def new_files(self, paths):
+        """
+        Select files that are new or whose content changed
+
+        Parameters:
+        -----------
+        paths : list
+            Candidate source files
+
+        Returns:
+        --------
+        dict
+            Mapping of new or changed file path to its fingerprint
+        """
+        changed = {}
+        for path in paths:
+            key = os.path.abspath(path)
+            known = self.files.get(key)
+            current = file_fingerprint(path, hash_content=False)
+            if known is not None and current['size'] == known['size'] \
+                    and current['mtime'] == known['mtime']:
+                continue
+            current = file_fingerprint(path)
+            if known is None or current['sha256'] != known['sha256']:
+                changed[key] = current
+            else:
+                # Touched but unchanged: just remember the new mtime
+                self.files[key] = current
+        return changed
+
+    def is_new(self, ids):
+        """Boolean mask of ids not processed before"""
+        hashes = id_hash64(ids)
+        if self.id_hashes.size == 0:
+            return np.ones(hashes.shape[0], dtype=bool)
+        pos = np.searchsorted(self.id_hashes, hashes)
+        pos = np.minimum(pos, self.id_hashes.size - 1)
+        return self.id_hashes[pos] != hashes
+
+    def record_ids(self, ids):
+        self.id_hashes = np.union1d(self.id_hashes, id_hash64(ids))
+
+    def record_files(self, fingerprints):
+        self.files.update(fingerprints)
+
+def process_new_loans(files, state_dir, store_dir, imputer, encoder, scaler,
+                      schema=None, test_size=0.2, salt='', n_jobs=None, read_kwargs=None):
+    """
+    Preprocess only loans not seen before and append them to the feature store
+
+    New or changed source files are read in parallel, loans whose id was
+    already processed are skipped, and the remaining delta goes through the
+    previously fitted imputer, encoder and scaler before being split by id
+    hash and appended to the X/y train and test stores. Cost is proportional
+    to the new data, not the whole history.
+
+    Parameters:
+    -----------
+    files : str or list
+        Glob pattern or list of source extracts
+    state_dir : str
+        Directory of the LoanManifest
+    store_dir : str
+        Directory of the X_train, X_test, y_train and y_test feature stores
+    imputer : MissingValueImputer
+        Fitted imputer for the selected features
+    encoder : CategoricalEncoder
+        Fitted categorical encoder
+    scaler : StreamingScaler
+        Fitted scaler
+    schema : dict, optional
+        Loader schema; must include the id column (defaults to LOAN_SCHEMA
+        plus LOAN_ID_SCHEMA)
+    test_size : float
+        Proportion of loans assigned to the test set
+    salt : str
+        Salt for the id hash split
+    n_jobs : int, optional
+        Number of worker processes for reading files
+    read_kwargs : dict, optional
+        Extra pd.read_csv arguments
+
+    Returns:
+    --------
+    int
+        Number of loans appended
+    """
+    schema = {**LOAN_SCHEMA, **LOAN_ID_SCHEMA} if schema is None else schema
+    manifest = LoanManifest.load(state_dir)
+    changed = manifest.new_files(_expand_files(files))
+    if not changed:
+        print("No new source files to process")
+        manifest.save()
+        return 0
+
+    fingerprint = preprocessing_fingerprint(imputer, encoder, scaler)
+    writers = {name: FeatureStoreWriter(os.path.join(store_dir, name), append=True,
+                                        dtype=np.int8 if name.startswith('y') else np.float32,
+                                        fingerprint=fingerprint)
+               for name in ['X_train', 'X_test', 'y_train', 'y_test']}
+    n_added = 0
+    try:
+        chunks = load_loan_files(list(changed), schema=schema, n_jobs=n_jobs, stream=True,
+                                 read_kwargs=read_kwargs)
+        for loans_df in chunks:
+            ids = loans_df[LOAN_ID_COLUMN]
+            new = manifest.is_new(ids) & ~ids.duplicated().to_numpy()
+            delta = loans_df[new]
+
+            X = imputer.transform(select_features(delta))
+            complete = X.notnull().all(axis=1).to_numpy()
+            X = X[complete]
+            delta = delta[complete]
+            X = scaler.transform(encoder.transform(X), inplace=True)
+            y = create_target_variable(delta, compact=True)
+
+            is_test = hash_split_mask(delta[LOAN_ID_COLUMN], test_size, salt)
+            writers['X_train'].write(X[~is_test])
+            writers['X_test'].write(X[is_test])
+            writers['y_train'].write(y[~is_test].rename('loan_status_binary'))
+            writers['y_test'].write(y[is_test].rename('loan_status_binary'))
+
+            manifest.record_ids(delta[LOAN_ID_COLUMN])
+            n_added += delta.shape[0]
+            print(f"Appended {delta.shape[0]} new loans "
+                  f"(skipped {(~new).sum()} seen, {(~complete).sum()} incomplete)")
+    except BaseException:
+        for writer in writers.values():
+            writer.abort()
+        raise
+    for writer in writers.values():
+        writer.close()
+
+    # Only mark files processed once their rows are safely in the store
+    manifest.record_files(changed)
+    manifest.save()
+    print(f"Processed {len(changed)} new files, {n_added} new loans")
+    return n_added
@@ -1,10 +1,347 @@
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Columns used for modeling (see preprocessor.select_features) plus the target
+# source, with the dtypes they are parsed as when streaming the raw file
+LOAN_SCHEMA = {
+    'loan_amnt': 'float64',
+    'term': 'object',
+    'int_rate': 'float64',
+    'installment': 'float64',
+    'grade': 'object',
+    'emp_length': 'object',
+    'home_ownership': 'object',
+    'annual_inc': 'float64',
+    'dti': 'float64',
+    'delinq_2yrs': 'float64',
+    'fico_range_low': 'float64',
+    'fico_range_high': 'float64',
+    'inq_last_6mths': 'float64',
+    'open_acc': 'float64',
+    'pub_rec': 'float64',
+    'revol_bal': 'float64',
+    'revol_util': 'float64',
+    'total_acc': 'float64',
+    'loan_status': 'object'
+}
+
+# LendingClub loan id, read as text so it hashes the same in every extract.
+# Add it to a schema for id-based splitting: {**LOAN_SCHEMA, **LOAN_ID_SCHEMA}
+LOAN_ID_COLUMN = 'id'
+LOAN_ID_SCHEMA = {LOAN_ID_COLUMN: 'object'}
+
+# Memory-compact variant: low-cardinality strings as categoricals and
+# continuous features as float32 (about 7 significant digits, ample for
+# amounts, rates and ratios). Counts stay float32 at load because they can be
+# missing; compact_dtypes downcasts them to small ints after imputation.
+COMPACT_LOAN_SCHEMA = {
+    col: 'category' if dtype == 'object' else 'float32'
+    for col, dtype in LOAN_SCHEMA.items()
+}
+
+# Integer-valued columns and the int dtype they fit after imputation
+COUNT_DTYPES = {
+    'delinq_2yrs': 'int16',
+    'fico_range_low': 'int16',
+    'fico_range_high': 'int16',
+    'inq_last_6mths': 'int16',
+    'open_acc': 'int16',
+    'pub_rec': 'int16',
+    'total_acc': 'int16'
+}
+
+DEFAULT_STATUSES = ['Charged Off', 'Default', 'Late (31-120 days)']
 
-def load_loan_data(file_path):
-    loans_df = pd.read_csv(file_path)
+def load_loan_data(file_path, schema=None, chunksize=None, stream=False, compact=False,
+                   verbose=True):
+    """
+    Load loan data, optionally streaming only the columns in a schema
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the loan CSV file
+    schema : dict, optional
+        Mapping of column name to dtype. Only these columns are parsed.
+        Defaults to LOAN_SCHEMA when chunksize or stream is given.
+    chunksize : int, optional
+        Number of rows per chunk when reading in streaming mode
+    stream : bool
+        If True, return a generator of chunks instead of one DataFrame
+    compact : bool
+        Use COMPACT_LOAN_SCHEMA (categoricals and float32) as the default schema
+    verbose : bool
+        Print rows and bytes per chunk
+
+    Returns:
+    --------
+    pandas.DataFrame or generator
+        Loan data, or a generator of DataFrame chunks if stream is True
+    """
+    if schema is None and chunksize is None and not stream and not compact:
+        loans_df = pd.read_csv(file_path)
+        print(f"Loaded {loans_df.shape[0]} loans with {loans_df.shape[1]} features")
+        return loans_df
+
+    chunks = iter_loan_chunks(file_path, schema=schema, chunksize=chunksize or 100000,
+                              compact=compact, verbose=verbose)
+    if stream:
+        return chunks
+
+    loans_df = concat_chunks(chunks)
     print(f"Loaded {loans_df.shape[0]} loans with {loans_df.shape[1]} features")
     return loans_df
 
-def create_target_variable(loans_df):
-    return loans_df['loan_status'].apply(
-        lambda x: 1 if x in ['Charged Off', 'Default', 'Late (31-120 days)'] else 0)
\ No newline at end of file
+def iter_loan_chunks(file_path, schema=None, chunksize=100000, compact=False, verbose=True):
+    """
+    Stream loan data in fixed-size chunks using an explicit column/dtype schema
+
+    Peak memory is bounded by the chunk size rather than the file size, since
+    only the schema columns are parsed and one chunk is resident at a time.
+
+    Parameters:
+    -----------
+    file_path : str
+        Path to the loan CSV file
+    schema : dict, optional
+        Mapping of column name to dtype (defaults to LOAN_SCHEMA)
+    chunksize : int
+        Number of rows per chunk
+    compact : bool
+        Use COMPACT_LOAN_SCHEMA as the default schema
+    verbose : bool
+        Print rows and bytes per chunk
+
+    Yields:
+    -------
+    pandas.DataFrame
+        Chunk of loan data with the schema columns
+    """
+    if schema is None:
+        schema = COMPACT_LOAN_SCHEMA if compact else LOAN_SCHEMA
+
+    reader = pd.read_csv(file_path, usecols=list(schema), dtype=schema, chunksize=chunksize)
+    with reader:
+        for i, chunk in enumerate(reader):
+            # Keep the column order of the schema regardless of file order
+            chunk = chunk[list(schema)]
+            if verbose:
+                chunk_bytes = chunk.memory_usage(deep=True).sum()
+                print(f"Chunk {i+1}: {chunk.shape[0]} rows, {chunk_bytes / 1e6:.1f} MB")
+            yield chunk
+
+def concat_chunks(chunks, ignore_index=False):
+    """
+    Concatenate DataFrame chunks, keeping categorical columns categorical
+
+    Chunks parsed separately carry different category sets, which a plain
+    pd.concat would turn back into object columns.
+
+    Parameters:
+    -----------
+    chunks : iterable of pandas.DataFrame
+        Chunks with identical columns
+    ignore_index : bool
+        Renumber the rows instead of keeping the chunk indices
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Combined data
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return pd.DataFrame()
+    for col, dtype in chunks[0].dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = union_categoricals([chunk[col] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=ignore_index)
+
+def _read_loan_file(file_path, schema, read_kwargs):
+    start = time.perf_counter()
+    loans_df = pd.read_csv(file_path, usecols=list(schema), dtype=schema,
+                           **read_kwargs)[list(schema)]
+    return loans_df, time.perf_counter() - start
+
+def _expand_files(files):
+    if isinstance(files, str):
+        paths = sorted(glob.glob(files))
+        if not paths:
+            raise FileNotFoundError(f"No files match {files}")
+        return paths
+    return list(files)
+
+def load_loan_files(files, schema=None, compact=False, n_jobs=None, stream=False,
+                    return_report=False, read_kwargs=None):
+    """
+    Load several loan extracts (CSV or compressed CSV) in a process pool
+
+    Each worker parses one file with the schema's column projection and
+    dtypes, so ingestion throughput scales with the number of cores.
+
+    Parameters:
+    -----------
+    files : str or list
+        Glob pattern (e.g. 'data/LoanStats_*.csv.gz') or list of file paths
+    schema : dict, optional
+        Mapping of column name to dtype (defaults to LOAN_SCHEMA)
+    compact : bool
+        Use COMPACT_LOAN_SCHEMA as the default schema
+    n_jobs : int, optional
+        Number of worker processes (defaults to the number of cores)
+    stream : bool
+        If True, return a generator yielding one DataFrame per file, in file
+        order, as the pool finishes them; at most n_jobs files are parsed
+        ahead of the consumer
+    return_report : bool
+        Also return a DataFrame with rows, seconds and MB/s per file
+        (ignored when streaming)
+    read_kwargs : dict, optional
+        Extra pd.read_csv arguments, e.g. {'skiprows': 1} for extracts that
+        start with a notes line
+
+    Returns:
+    --------
+    pandas.DataFrame or generator
+        Combined loan data (and the ingestion report if return_report),
+        or a generator of per-file DataFrames if stream is True
+    """
+    if schema is None:
+        schema = COMPACT_LOAN_SCHEMA if compact else LOAN_SCHEMA
+    paths = _expand_files(files)
+
+    chunks = _iter_loan_files(paths, schema, n_jobs, read_kwargs or {})
+    if stream:
+        return (loans_df for loans_df, _ in chunks)
+
+    start = time.perf_counter()
+    frames, rows = [], []
+    for loans_df, stats in chunks:
+        frames.append(loans_df)
+        rows.append(stats)
+    loans_df = concat_chunks(frames, ignore_index=True)
+    elapsed = time.perf_counter() - start
+
+    report = pd.DataFrame(rows)
+    print(f"Loaded {loans_df.shape[0]} loans with {loans_df.shape[1]} features "
+          f"from {len(paths)} files in {elapsed:.1f}s")
+    if return_report:
+        return loans_df, report
+    return loans_df
+
+def _iter_loan_files(paths, schema, n_jobs, read_kwargs):
+    n_workers = n_jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        # Keep at most one pending file per worker, so parsed frames that have
+        # not been consumed yet cannot pile up in memory
+        pending = deque()
+        remaining = iter(paths)
+        for file_path in islice(remaining, n_workers):
+            pending.append((file_path, executor.submit(_read_loan_file, file_path, schema, read_kwargs)))
+        while pending:
+            file_path, future = pending.popleft()
+            loans_df, seconds = future.result()
+            for next_path in islice(remaining, 1):
+                pending.append((next_path, executor.submit(_read_loan_file, next_path, schema, read_kwargs)))
+            size_mb = os.path.getsize(file_path) / 1e6
+            print(f"{os.path.basename(file_path)}: {loans_df.shape[0]} rows in {seconds:.1f}s "
+                  f"({size_mb / max(seconds, 1e-9):.1f} MB/s)")
+            yield loans_df, {'file': file_path, 'rows': loans_df.shape[0],
+                             'seconds': seconds, 'mb_per_s': size_mb / max(seconds, 1e-9)}
+
+def compact_dtypes(loans_df, count_dtypes=None, inplace=False):
+    """
+    Convert loan data to a memory-compact representation
+
+    Text columns become categoricals, float64 columns become float32, and
+    count columns without missing values are downcast to small ints.
+
+    Parameters:
+    -----------
+    loans_df : pandas.DataFrame
+        Loan data
+    count_dtypes : dict, optional
+        Mapping of count column to int dtype (defaults to COUNT_DTYPES)
+    inplace : bool
+        Convert loans_df in place instead of a copy
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Loan data with compact dtypes
+    """
+    count_dtypes = COUNT_DTYPES if count_dtypes is None else count_dtypes
+    if not inplace:
+        loans_df = loans_df.copy()
+
+    for col in loans_df.columns:
+        values = loans_df[col]
+        if col in count_dtypes and values.dtype.kind == 'f' and not values.isnull().any():
+            if (values == np.round(values)).all():
+                loans_df[col] = values.astype(count_dtypes[col])
+                continue
+        if values.dtype == 'float64':
+            loans_df[col] = values.astype('float32')
+        elif values.dtype == 'object' or pd.api.types.is_string_dtype(values.dtype):
+            loans_df[col] = values.astype('category')
+    return loans_df
+
+def memory_report(before_df, after_df):
+    """
+    Compare memory usage per column before and after a conversion
+
+    Parameters:
+    -----------
+    before_df : pandas.DataFrame
+        Data before conversion
+    after_df : pandas.DataFrame
+        Data after conversion
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Bytes and dtype per column before and after, with a total row
+    """
+    before = before_df.memory_usage(deep=True, index=False)
+    after = after_df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'dtype_before': before_df.dtypes.astype(str),
+        'bytes_before': before,
+        'dtype_after': after_df.dtypes.astype(str).reindex(before.index),
+        'bytes_after': after.reindex(before.index)
+    })
+    report.loc['Total'] = ['', before.sum(), '', after.sum()]
+    report['reduction (%)'] = (1 - report['bytes_after'] / report['bytes_before']) * 100
+    return report
+
+def create_target_variable(loans_df, default_statuses=None, compact=False):
+    """
+    Create the binary default target from loan_status
+
+    Parameters:
+    -----------
+    loans_df : pandas.DataFrame
+        Loan data with a loan_status column
+    default_statuses : list, optional
+        Statuses counted as default (defaults to DEFAULT_STATUSES)
+    compact : bool
+        Return int8 instead of int64
+
+    Returns:
+    --------
+    pandas.Series
+        1 for defaulted loans, 0 otherwise
+    """
+    default_statuses = DEFAULT_STATUSES if default_statuses is None else default_statuses
+    target = loans_df['loan_status'].isin(default_statuses)
+    return target.astype('int8' if compact else 'int64')
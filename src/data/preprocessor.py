@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
+import joblib
 
 def select_features(loans_df):
     """
@@ -24,7 +25,145 @@ def select_features(loans_df):
     
     return loans_df[features]
 
-def encode_categorical(feature_df):
+CATEGORICAL_FEATURES = ['term', 'grade', 'emp_length', 'home_ownership']
+
+class CategoricalEncoder:
+    """
+    One-hot encoder with a fixed, learned vocabulary
+
+    Produces the same column layout as pd.get_dummies(drop_first=True) on the
+    data it was fitted on, but the layout stays stable for any later chunk:
+    categories missing from a chunk give all-zero columns and unseen
+    categories are ignored. The vocabulary can be learned in one pass over a
+    chunk stream with partial_fit.
+
+    Parameters:
+    -----------
+    columns : list, optional
+        Categorical columns to encode (defaults to CATEGORICAL_FEATURES)
+    drop_first : bool
+        Drop the first (sorted) category of each column
+    """
+
+    def __init__(self, columns=None, drop_first=True):
+        self.columns = list(CATEGORICAL_FEATURES if columns is None else columns)
+        self.drop_first = drop_first
+        self._seen = {col: set() for col in self.columns}
+        self.categories_ = None
+
+    def partial_fit(self, df):
+        """Add the categories present in a chunk to the vocabulary"""
+        for col in self.columns:
+            self._seen[col].update(df[col].dropna().unique().tolist())
+        self.categories_ = {col: sorted(values) for col, values in self._seen.items()}
+        self.input_columns_ = list(df.columns)
+        return self
+
+    def fit(self, df):
+        """Learn the vocabulary from a DataFrame or an iterable of chunks"""
+        self._seen = {col: set() for col in self.columns}
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    @property
+    def numeric_columns_(self):
+        return [col for col in self.input_columns_ if col not in self.columns]
+
+    @property
+    def dummy_columns_(self):
+        start = 1 if self.drop_first else 0
+        return [f"{col}_{value}" for col in self.columns
+                for value in self.categories_[col][start:]]
+
+    @property
+    def feature_names_(self):
+        return self.numeric_columns_ + self.dummy_columns_
+
+    def _indicators(self, df):
+        n_rows = df.shape[0]
+        blocks = []
+        start = 1 if self.drop_first else 0
+        for col in self.columns:
+            categories = self.categories_[col]
+            # Codes are -1 for missing and unseen values, which get no indicator
+            codes = pd.Categorical(df[col], categories=categories).codes.astype(np.int64) - start
+            block = np.zeros((n_rows, len(categories) - start), dtype=np.uint8)
+            rows = np.flatnonzero(codes >= 0)
+            block[rows, codes[rows]] = 1
+            blocks.append(block)
+        return np.hstack(blocks) if blocks else np.zeros((n_rows, 0), dtype=np.uint8)
+
+    def transform(self, df, output='frame'):
+        """
+        Encode a DataFrame or chunk into the fitted column layout
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            Data with the columns seen during fit
+        output : str
+            'frame' for a DataFrame (numeric columns plus boolean dummies),
+            'uint8' for a uint8 array of the dummy columns only, or
+            'sparse' for a scipy.sparse CSR matrix of the full layout
+
+        Returns:
+        --------
+        pandas.DataFrame, numpy.ndarray or scipy.sparse.csr_matrix
+            Encoded data
+        """
+        if self.categories_ is None:
+            raise ValueError("CategoricalEncoder must be fitted before transform")
+
+        indicators = self._indicators(df)
+        if output == 'uint8':
+            return indicators
+        if output == 'sparse':
+            from scipy import sparse
+            numeric = df[self.numeric_columns_].to_numpy(dtype=np.float64)
+            return sparse.hstack([sparse.csr_matrix(numeric),
+                                  sparse.csr_matrix(indicators)], format='csr')
+        if output != 'frame':
+            raise ValueError(f"Unknown output type: {output}")
+
+        dummies = pd.DataFrame(indicators.astype(bool), index=df.index, columns=self.dummy_columns_)
+        return pd.concat([df[self.numeric_columns_], dummies], axis=1)
+
+    def fit_transform(self, df, output='frame'):
+        return self.fit(df).transform(df, output=output)
+
+    def transform_chunks(self, chunks, output='frame', n_jobs=-1):
+        """
+        Encode an iterable of chunks in parallel, preserving chunk order
+
+        Parameters:
+        -----------
+        chunks : iterable of pandas.DataFrame
+            Chunks to encode
+        output : str
+            Output type, see transform
+        n_jobs : int
+            Number of parallel workers (-1 uses all cores)
+
+        Yields:
+        -------
+        pandas.DataFrame, numpy.ndarray or scipy.sparse.csr_matrix
+            Encoded chunks
+        """
+        from joblib import Parallel, delayed
+
+        parallel = Parallel(n_jobs=n_jobs, return_as='generator')
+        yield from parallel(delayed(self.transform)(chunk, output) for chunk in chunks)
+
+    def save(self, filepath):
+        joblib.dump(self, filepath)
+
+    @staticmethod
+    def load(filepath):
+        return joblib.load(filepath)
+
+def encode_categorical(feature_df, encoder=None):
     """
     Encode categorical variables using one-hot encoding
     
@@ -32,15 +171,84 @@ def encode_categorical(feature_df):
     -----------
     feature_df : pandas.DataFrame
         Data with selected features
+    encoder : CategoricalEncoder, optional
+        Fitted encoder to reuse. If not given, one is fitted on the
+        categorical (text) columns of feature_df.
         
     Returns:
     --------
     pandas.DataFrame
         Data with encoded categorical features
     """
-    return pd.get_dummies(feature_df, drop_first=True)
+    if encoder is None:
+        columns = feature_df.select_dtypes(include=['object', 'category', 'string']).columns
+        encoder = CategoricalEncoder(columns=columns).fit(feature_df)
+    return encoder.transform(feature_df)
+
+def hash_ids(ids, salt=''):
+    """
+    Map loan ids to stable pseudo-random numbers in [0, 1)
+
+    The value depends only on the id (as a string) and the salt, not on row
+    order or on which other loans are present.
+
+    Parameters:
+    -----------
+    ids : array-like
+        Loan ids
+    salt : str
+        Salt mixed into the hash to draw a different assignment
+
+    Returns:
+    --------
+    numpy.ndarray
+        Hash values in [0, 1)
+    """
+    hashes = id_hash64(ids, salt)
+    return (hashes >> np.uint64(11)) / float(1 << 53)
 
-def split_data(X, y, test_size=0.2, random_state=42):
+def id_hash64(ids, salt=''):
+    """
+    64-bit stable hash of loan ids (as strings), see hash_ids
+
+    Parameters:
+    -----------
+    ids : array-like
+        Loan ids
+    salt : str
+        Salt mixed into the hash
+
+    Returns:
+    --------
+    numpy.ndarray
+        uint64 hashes
+    """
+    keys = pd.Series(np.asarray(ids)).astype(str)
+    if salt:
+        keys = salt + ':' + keys
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+def hash_split_mask(ids, test_size=0.2, salt=''):
+    """
+    Boolean test-set mask from a stable hash of loan ids
+
+    Parameters:
+    -----------
+    ids : array-like
+        Loan ids
+    test_size : float
+        Proportion of loans assigned to the test set
+    salt : str
+        Salt mixed into the hash
+
+    Returns:
+    --------
+    numpy.ndarray
+        True for loans in the test set
+    """
+    return hash_ids(ids, salt) < test_size
+
+def split_data(X, y, test_size=0.2, random_state=42, ids=None, stratify=False, salt=''):
     """
     Split data into training and testing sets
     
@@ -54,15 +262,58 @@ def split_data(X, y, test_size=0.2, random_state=42):
         Proportion of data to use for testing
     random_state : int
         Random seed for reproducibility
+    ids : array-like, optional
+        Loan ids. If given, each loan is assigned from a stable hash of its
+        id instead of a random shuffle, so the assignment does not depend on
+        row order and does not change when new loans are appended.
+    stratify : bool
+        Stratify by y. With ids, the hash is independent of the target, so
+        each class is split at test_size in expectation; the achieved
+        per-class test fractions are printed.
+    salt : str
+        Salt for the id hash
         
     Returns:
     --------
     tuple
         (X_train, X_test, y_train, y_test)
     """
-    return train_test_split(X, y, test_size=test_size, random_state=random_state)
+    if ids is None:
+        return train_test_split(X, y, test_size=test_size, random_state=random_state,
+                                stratify=y if stratify else None)
+
+    is_test = hash_split_mask(ids, test_size, salt)
+    if stratify:
+        fractions = pd.Series(is_test).groupby(np.asarray(y)).mean()
+        for label, fraction in fractions.items():
+            print(f"Class {label}: {fraction*100:.2f}% in test set")
+    return X[~is_test], X[is_test], y[~is_test], y[is_test]
+
+def iter_hash_split(chunks, id_col='id', test_size=0.2, salt=''):
+    """
+    Split a stream of chunks into train and test parts by id hash
+
+    Parameters:
+    -----------
+    chunks : iterable of pandas.DataFrame
+        Chunks containing an id column
+    id_col : str
+        Name of the loan id column
+    test_size : float
+        Proportion of loans assigned to the test set
+    salt : str
+        Salt for the id hash
+
+    Yields:
+    -------
+    tuple
+        (train_chunk, test_chunk)
+    """
+    for chunk in chunks:
+        is_test = hash_split_mask(chunk[id_col], test_size, salt)
+        yield chunk[~is_test], chunk[is_test]
 
-def scale_features(X_train, X_test):
+def scale_features(X_train, X_test, copy=True):
     """
     Scale numerical features using StandardScaler
     
@@ -72,6 +323,8 @@ def scale_features(X_train, X_test):
         Training feature matrix
     X_test : pandas.DataFrame
         Testing feature matrix
+    copy : bool
+        If False, scale X_train and X_test in place instead of copying them
         
     Returns:
     --------
@@ -79,18 +332,263 @@ def scale_features(X_train, X_test):
         (X_train_scaled, X_test_scaled, scaler)
     """
     scaler = StandardScaler()
-    numerical_cols = X_train.select_dtypes(include=['float64', 'int64']).columns
+    # Any numeric width (compact float32/int16 included); boolean dummies are left as is
+    numerical_cols = X_train.select_dtypes(include='number').columns
     
-    X_train_scaled = X_train.copy()
-    X_test_scaled = X_test.copy()
+    X_train_scaled = X_train.copy() if copy else X_train
+    X_test_scaled = X_test.copy() if copy else X_test
     
     X_train_scaled[numerical_cols] = scaler.fit_transform(X_train[numerical_cols])
     X_test_scaled[numerical_cols] = scaler.transform(X_test[numerical_cols])
     
     return X_train_scaled, X_test_scaled, scaler
 
+class StreamingScaler:
+    """
+    Out-of-core standard scaler for chunked feature matrices
+
+    Accumulates means and variances over chunks with partial_fit, so the
+    training matrix never has to be resident at once, and scales later
+    chunks as a stream. Wraps sklearn's StandardScaler, which keeps the
+    running statistics.
+
+    Parameters:
+    -----------
+    columns : list, optional
+        Columns to scale. Defaults to the numeric (non-boolean) columns of
+        the first chunk seen.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = None if columns is None else list(columns)
+        self.scaler_ = StandardScaler()
+
+    def partial_fit(self, chunk):
+        """Update the running mean and variance with one chunk"""
+        if self.columns is None:
+            self.columns = chunk.select_dtypes(include='number').columns.tolist()
+        self.scaler_.partial_fit(chunk[self.columns].to_numpy(dtype=np.float64))
+        return self
+
+    def fit(self, chunks):
+        """Fit on a DataFrame or an iterable of chunks"""
+        self.scaler_ = StandardScaler()
+        chunks = [chunks] if isinstance(chunks, pd.DataFrame) else chunks
+        for chunk in chunks:
+            self.partial_fit(chunk)
+        return self
+
+    @property
+    def mean_(self):
+        return pd.Series(self.scaler_.mean_, index=self.columns)
+
+    @property
+    def scale_(self):
+        return pd.Series(self.scaler_.scale_, index=self.columns)
+
+    def transform(self, chunk, inplace=False):
+        """
+        Scale one chunk
+
+        Parameters:
+        -----------
+        chunk : pandas.DataFrame
+            Chunk with the fitted columns
+        inplace : bool
+            Overwrite the columns of chunk instead of returning a copy
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Scaled chunk
+        """
+        scaled = self.scaler_.transform(chunk[self.columns].to_numpy(dtype=np.float64))
+        if not inplace:
+            chunk = chunk.copy()
+        for i, col in enumerate(self.columns):
+            chunk[col] = scaled[:, i]
+        return chunk
+
+    def transform_stream(self, chunks):
+        """
+        Scale a stream of chunks in place, one chunk resident at a time
+
+        Parameters:
+        -----------
+        chunks : iterable of pandas.DataFrame
+            Chunks to scale
+
+        Yields:
+        -------
+        pandas.DataFrame
+            Scaled chunks
+        """
+        for chunk in chunks:
+            yield self.transform(chunk, inplace=True)
+
+    def save(self, filepath):
+        joblib.dump(self, filepath)
+
+    @staticmethod
+    def load(filepath):
+        return joblib.load(filepath)
+
+def scale_to_array(scaler, chunks, out, dtype=np.float32):
+    """
+    Scale a stream of chunks straight into a destination array
+
+    Parameters:
+    -----------
+    scaler : StreamingScaler
+        Fitted scaler
+    chunks : iterable of pandas.DataFrame
+        Chunks to scale
+    out : numpy.ndarray
+        Preallocated destination, e.g. a numpy.memmap
+    dtype : numpy.dtype
+        Dtype of the written rows
+
+    Returns:
+    --------
+    int
+        Number of rows written
+    """
+    row = 0
+    for chunk in scaler.transform_stream(chunks):
+        out[row:row + chunk.shape[0]] = chunk.to_numpy(dtype=dtype)
+        row += chunk.shape[0]
+    return row
+
+class MissingValueImputer:
+    """
+    Fitted missing-value imputer
+
+    Learns the columns to drop and the zero/mode/median/grouped fill values
+    once, so the statistics from the training data can be reapplied to test
+    and scoring data without recomputation. A column listed under several
+    strategies is filled by the first of zero, mode, median.
+
+    Parameters:
+    -----------
+    zero_fill_cols : list, optional
+        Columns to fill with zeros (typically delinquency or count columns)
+    mode_fill_cols : list, optional
+        Columns to fill with mode (typically categorical columns)
+    median_fill_cols : list, optional
+        Columns to fill with median (typically continuous numeric columns)
+    drop_threshold : float, optional
+        Drop columns with missing ratio greater than this threshold
+    group_fill_cols : dict, optional
+        Dictionary with format {target_col: grouping_col} for grouped imputation
+    """
+
+    def __init__(self, zero_fill_cols=None, mode_fill_cols=None, median_fill_cols=None,
+                 drop_threshold=0.5, group_fill_cols=None):
+        self.zero_fill_cols = zero_fill_cols or []
+        self.mode_fill_cols = mode_fill_cols or []
+        self.median_fill_cols = median_fill_cols or []
+        self.drop_threshold = drop_threshold
+        self.group_fill_cols = group_fill_cols or {}
+
+    def fit(self, df):
+        """Learn dropped columns and fill statistics from a DataFrame"""
+        # One pass for all null counts
+        missing_counts = df.isnull().sum()
+        if self.drop_threshold:
+            missing_ratio = missing_counts / len(df)
+            self.cols_to_drop_ = missing_ratio[missing_ratio > self.drop_threshold].index.tolist()
+        else:
+            self.cols_to_drop_ = []
+        kept = set(df.columns) - set(self.cols_to_drop_)
+        has_missing = set(missing_counts[missing_counts > 0].index) & kept
+
+        fill_values = {}
+        for col in self.zero_fill_cols:
+            if col in kept:
+                fill_values.setdefault(col, 0)
+
+        mode_cols = [col for col in self.mode_fill_cols
+                     if col in has_missing and col not in fill_values]
+        if mode_cols:
+            fill_values.update(df[mode_cols].mode().iloc[0].to_dict())
+
+        median_cols = [col for col in self.median_fill_cols
+                       if col in has_missing and col not in fill_values]
+        if median_cols:
+            fill_values.update(df[median_cols].median().to_dict())
+        self.fill_values_ = fill_values
+
+        # One groupby per grouping column covers all of its target columns
+        self.group_values_ = {}
+        targets_by_group = {}
+        for target_col, group_col in self.group_fill_cols.items():
+            if target_col in kept and group_col in kept:
+                targets_by_group.setdefault(group_col, []).append(target_col)
+        for group_col, targets in targets_by_group.items():
+            # Group on the key as it will look after the flat fills
+            key = df[group_col]
+            if group_col in fill_values:
+                key = key.fillna(fill_values[group_col])
+            numeric = [col for col in targets if df[col].dtype.kind in 'fc']
+            if numeric:
+                medians = df[numeric].groupby(key, observed=True).median()
+                for col in numeric:
+                    self.group_values_[col] = (group_col, medians[col])
+            for col in targets:
+                if col in numeric:
+                    continue
+                counts = df.groupby([key, df[col]], observed=True).size()
+                modes = counts.sort_values(ascending=False, kind='stable').reset_index()
+                modes = modes.drop_duplicates(group_col).set_index(group_col)[col]
+                self.group_values_[col] = (group_col, modes)
+        return self
+
+    def transform(self, df, inplace=False):
+        """
+        Apply the fitted drops and fills
+
+        Parameters:
+        -----------
+        df : pandas.DataFrame
+            Data to impute
+        inplace : bool
+            Modify df in place instead of returning a copy
+
+        Returns:
+        --------
+        pandas.DataFrame
+            Imputed data (df itself if inplace)
+        """
+        if not inplace:
+            df = df.copy()
+        cols_to_drop = [col for col in self.cols_to_drop_ if col in df.columns]
+        if cols_to_drop:
+            df.drop(columns=cols_to_drop, inplace=True)
+
+        fill_values = {col: value for col, value in self.fill_values_.items()
+                       if col in df.columns}
+        if fill_values:
+            df.fillna(fill_values, inplace=True)
+
+        for target_col, (group_col, values) in self.group_values_.items():
+            if target_col in df.columns and group_col in df.columns:
+                missing = df[target_col].isnull()
+                if missing.any():
+                    df.loc[missing, target_col] = df.loc[missing, group_col].map(values)
+        return df
+
+    def fit_transform(self, df, inplace=False):
+        return self.fit(df).transform(df, inplace=inplace)
+
+    def save(self, filepath):
+        joblib.dump(self, filepath)
+
+    @staticmethod
+    def load(filepath):
+        return joblib.load(filepath)
+
 def handle_missing_values(df, zero_fill_cols=None, mode_fill_cols=None, median_fill_cols=None, 
-                          drop_threshold=0.5, group_fill_cols=None):
+                          drop_threshold=0.5, group_fill_cols=None, inplace=False):
     """
     Handle missing values in the dataset using various strategies
     
@@ -108,6 +606,8 @@ def handle_missing_values(df, zero_fill_cols=None, mode_fill_cols=None, median_f
         Drop columns with missing ratio greater than this threshold
     group_fill_cols : dict, optional
         Dictionary with format {target_col: grouping_col} for grouped imputation
+    inplace : bool, optional
+        Modify df in place instead of working on a copy
         
     Returns:
     --------
@@ -116,41 +616,10 @@ def handle_missing_values(df, zero_fill_cols=None, mode_fill_cols=None, median_f
     list
         List of dropped columns
     """
-    df_processed = df.copy()
-    
-    # Drop columns with too many missing values
+    imputer = MissingValueImputer(zero_fill_cols, mode_fill_cols, median_fill_cols,
+                                  drop_threshold, group_fill_cols)
+    df_processed = imputer.fit_transform(df, inplace=inplace)
     if drop_threshold:
-        missing_ratio = df_processed.isnull().sum() / len(df_processed)
-        cols_to_drop = missing_ratio[missing_ratio > drop_threshold].index.tolist()
-        df_processed = df_processed.drop(columns=cols_to_drop)
-        print(f"Dropped {len(cols_to_drop)} columns with > {drop_threshold*100}% missing values")
-    else:
-        cols_to_drop = []
-    
-    # Fill missing with zeros (common for count features)
-    if zero_fill_cols:
-        for col in zero_fill_cols:
-            if col in df_processed.columns:
-                df_processed[col] = df_processed[col].fillna(0)
-    
-    # Fill missing with mode (common for categorical features)
-    if mode_fill_cols:
-        for col in mode_fill_cols:
-            if col in df_processed.columns and df_processed[col].isnull().sum() > 0:
-                df_processed[col] = df_processed[col].fillna(df_processed[col].mode()[0])
-    
-    # Fill missing with median (common for continuous features)
-    if median_fill_cols:
-        for col in median_fill_cols:
-            if col in df_processed.columns and df_processed[col].isnull().sum() > 0:
-                df_processed[col] = df_processed[col].fillna(df_processed[col].median())
-    
-    # Group-based imputation (e.g., fill DTI based on grade)
-    if group_fill_cols:
-        for target_col, group_col in group_fill_cols.items():
-            if target_col in df_processed.columns and group_col in df_processed.columns:
-                df_processed[target_col] = df_processed.groupby(group_col)[target_col].transform(
-                    lambda x: x.fillna(x.median() if x.dtype.kind in 'fc' else x.mode()[0])
-                )
+        print(f"Dropped {len(imputer.cols_to_drop_)} columns with > {drop_threshold*100}% missing values")
     
-    return df_processed, cols_to_drop
\ No newline at end of file
+    return df_processed, imputer.cols_to_drop_
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from .loader import LOAN_ID_COLUMN, LOAN_SCHEMA
+
+# Category frequencies roughly as in the LendingClub 2007-2018 extract
+TERMS = {' 36 months': 0.71, ' 60 months': 0.29}
+GRADES = {'A': 0.19, 'B': 0.29, 'C': 0.29, 'D': 0.14, 'E': 0.06, 'F': 0.02, 'G': 0.01}
+EMP_LENGTHS = {'< 1 year': 0.08, '1 year': 0.07, '2 years': 0.09, '3 years': 0.08,
+               '4 years': 0.06, '5 years': 0.06, '6 years': 0.05, '7 years': 0.04,
+               '8 years': 0.04, '9 years': 0.04, '10+ years': 0.39}
+HOME_OWNERSHIPS = {'MORTGAGE': 0.49, 'RENT': 0.39, 'OWN': 0.11, 'ANY': 0.006,
+                   'OTHER': 0.003, 'NONE': 0.001}
+
+# Share of missing values per column in the real extract
+MISSING_RATES = {
+    'emp_length': 0.065,
+    'dti': 0.0008,
+    'revol_util': 0.0008,
+    'inq_last_6mths': 0.00001,
+    'annual_inc': 0.000002,
+    'delinq_2yrs': 0.000013,
+    'open_acc': 0.000013,
+    'pub_rec': 0.000013,
+    'total_acc': 0.000013
+}
+
+# Interest rate (%) and default rate by grade
+GRADE_RATES = {'A': 7.1, 'B': 10.7, 'C': 14.1, 'D': 18.1, 'E': 21.8, 'F': 25.4, 'G': 28.1}
+GRADE_DEFAULT_RATES = {'A': 0.06, 'B': 0.13, 'C': 0.22, 'D': 0.30, 'E': 0.38, 'F': 0.45, 'G': 0.50}
+
+def _choice(rng, table, size):
+    labels = np.array(list(table), dtype=object)
+    probs = np.array(list(table.values()))
+    return labels[rng.choice(len(labels), size=size, p=probs / probs.sum())]
+
+def generate_loan_data(n_rows=10000, random_state=42, missing_rates=None, include_id=True):
+    """
+    Generate a synthetic LendingClub-shaped loan dataset
+
+    The 18 modeling columns and loan_status get the dtypes of LOAN_SCHEMA,
+    the real category sets and frequencies, and the real missingness
+    (MISSING_RATES). Interest rate, FICO and default probability depend on
+    grade, so models trained on the data have a signal to find. Meant for
+    benchmarks and tests, not for modeling conclusions.
+
+    Parameters:
+    -----------
+    n_rows : int
+        Number of loans
+    random_state : int
+        Random seed for reproducibility
+    missing_rates : dict, optional
+        Share of missing values per column (defaults to MISSING_RATES)
+    include_id : bool
+        Add a text loan id column
+
+    Returns:
+    --------
+    pandas.DataFrame
+        Synthetic loan data
+    """
+    rng = np.random.default_rng(random_state)
+    missing_rates = MISSING_RATES if missing_rates is None else missing_rates
+
+    grade = _choice(rng, GRADES, n_rows)
+    grade_idx = np.searchsorted(np.array(list(GRADES)), grade.astype(str))
+    term = _choice(rng, TERMS, n_rows)
+    n_payments = np.where(term == ' 60 months', 60, 36)
+
+    int_rate = np.array(list(GRADE_RATES.values()))[grade_idx] + rng.normal(0, 1.2, n_rows)
+    int_rate = np.round(np.clip(int_rate, 5.3, 31.0), 2)
+    loan_amnt = np.round(np.clip(rng.lognormal(9.4, 0.6, n_rows), 500, 40000) / 25) * 25
+    monthly_rate = int_rate / 1200
+    installment = np.round(loan_amnt * monthly_rate / (1 - (1 + monthly_rate) ** -n_payments), 2)
+
+    fico_low = np.clip(np.round((750 - 12 * grade_idx + rng.normal(0, 25, n_rows)) / 5) * 5, 610, 845)
+    total_acc = np.maximum(rng.poisson(24, n_rows), 2)
+
+    loans_df = pd.DataFrame({
+        'loan_amnt': loan_amnt,
+        'term': term,
+        'int_rate': int_rate,
+        'installment': installment,
+        'grade': grade,
+        'emp_length': _choice(rng, EMP_LENGTHS, n_rows),
+        'home_ownership': _choice(rng, HOME_OWNERSHIPS, n_rows),
+        'annual_inc': np.round(rng.lognormal(11.1, 0.55, n_rows), -2),
+        'dti': np.round(np.clip(rng.gamma(4.0, 4.6, n_rows), 0, 999), 2),
+        'delinq_2yrs': rng.poisson(0.3, n_rows).astype(np.float64),
+        'fico_range_low': fico_low,
+        'fico_range_high': fico_low + 4,
+        'inq_last_6mths': rng.poisson(0.6, n_rows).astype(np.float64),
+        'open_acc': np.minimum(rng.poisson(11, n_rows), total_acc).astype(np.float64),
+        'pub_rec': rng.poisson(0.2, n_rows).astype(np.float64),
+        'revol_bal': np.round(rng.lognormal(9.3, 1.0, n_rows)),
+        'revol_util': np.round(np.clip(rng.normal(50, 24, n_rows), 0, 150), 1),
+        'total_acc': total_acc.astype(np.float64)
+    })
+
+    default_rate = np.array(list(GRADE_DEFAULT_RATES.values()))[grade_idx]
+    is_default = rng.random(n_rows) < default_rate
+    loans_df['loan_status'] = np.where(
+        is_default,
+        _choice(rng, {'Charged Off': 0.93, 'Late (31-120 days)': 0.06, 'Default': 0.01}, n_rows),
+        _choice(rng, {'Fully Paid': 0.55, 'Current': 0.42, 'In Grace Period': 0.02,
+                      'Late (16-30 days)': 0.01}, n_rows))
+
+    for col, rate in missing_rates.items():
+        missing = rng.random(n_rows) < rate
+        loans_df.loc[missing, col] = np.nan
+
+    loans_df = loans_df.astype(LOAN_SCHEMA)
+    if include_id:
+        loans_df.insert(0, LOAN_ID_COLUMN, (np.arange(n_rows) + 1000000).astype(str).astype(object))
+    return loans_df
+
+def write_synthetic_csv(file_path, n_rows=10000, random_state=42, chunksize=500000):
+    """
+    Write a synthetic loan file in blocks, for datasets too large to build at once
+
+    Parameters:
+    -----------
+    file_path : str
+        Output CSV path
+    n_rows : int
+        Number of loans
+    random_state : int
+        Random seed; each block gets an independent seed derived from it
+    chunksize : int
+        Rows generated per block
+
+    Returns:
+    --------
+    str
+        Output CSV path
+    """
+    n_blocks = max(-(-n_rows // chunksize), 1)
+    seeds = np.random.SeedSequence(random_state).spawn(n_blocks)
+    for block, seed in enumerate(seeds):
+        size = min(chunksize, n_rows - block * chunksize)
+        chunk = generate_loan_data(size, random_state=seed)
+        chunk[LOAN_ID_COLUMN] = (np.arange(size) + 1000000 + block * chunksize).astype(str)
+        chunk.to_csv(file_path, mode='w' if block == 0 else 'a', header=block == 0, index=False)
+    return file_path
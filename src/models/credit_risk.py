@@ -1,5 +1,7 @@
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import log_loss
+import numpy as np
 import joblib
 
 def train_logistic_regression(X_train, y_train, max_iter=1000):
@@ -24,7 +26,104 @@ def train_logistic_regression(X_train, y_train, max_iter=1000):
     log_reg.fit(X_train, y_train)
     return log_reg
 
-def train_random_forest(X_train, y_train, n_estimators=100, random_state=42):
+def _iter_batches(source, batch_size, rng=None):
+    """Yield (X, y) batches from a callable, an (X, y) pair of arrays or a list of pairs"""
+    if callable(source):
+        yield from source()
+    elif isinstance(source, tuple):
+        X, y = source
+        starts = np.arange(0, X.shape[0], batch_size)
+        if rng is not None:
+            rng.shuffle(starts)
+        for start in starts:
+            yield X[start:start + batch_size], y[start:start + batch_size]
+    else:
+        yield from source
+
+def _check_source(source, name):
+    """Reject one-shot iterators, which would be exhausted after the first epoch"""
+    if not callable(source) and not isinstance(source, tuple) and iter(source) is source:
+        raise TypeError(f"{name} is a one-shot iterator; pass a callable returning a fresh "
+                        "iterator per epoch, an (X, y) pair or a list of chunks")
+
+def train_sgd_logistic(train_source, validation_source=None, n_epochs=10, batch_size=100000,
+                       alpha=1e-4, patience=2, tol=1e-4, random_state=42):
+    """
+    Train a logistic PD model out of core with SGD
+
+    The model is updated with partial_fit one batch at a time, so the full
+    training matrix never has to be in memory. With a validation source, the
+    log loss is measured after every epoch and training stops once it has
+    not improved by tol for patience epochs; the best epoch's weights are
+    kept.
+
+    Parameters:
+    -----------
+    train_source : callable, tuple or list
+        Training data as a callable returning a fresh iterator of (X, y)
+        chunks per epoch, an (X, y) pair of arrays (e.g. memory-mapped
+        feature stores) read in batches, or a list of (X, y) chunks.
+        Generators and other one-shot iterators raise a TypeError, since
+        they would be exhausted after the first epoch
+    validation_source : callable, tuple or list, optional
+        Held-out data in the same forms, used for early stopping
+    n_epochs : int
+        Maximum number of passes over the training data
+    batch_size : int
+        Rows per batch when train_source is an (X, y) pair
+    alpha : float
+        L2 regularization strength
+    patience : int
+        Epochs without improvement before stopping
+    tol : float
+        Minimum log loss improvement that counts
+    random_state : int
+        Random seed for reproducibility
+
+    Returns:
+    --------
+    sklearn.linear_model.SGDClassifier
+        Trained model with predict_proba (log loss)
+    """
+    _check_source(train_source, 'train_source')
+    if validation_source is not None:
+        _check_source(validation_source, 'validation_source')
+
+    model = SGDClassifier(loss='log_loss', alpha=alpha, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    classes = np.array([0, 1])
+
+    best_loss, best_state, stale = np.inf, None, 0
+    for epoch in range(n_epochs):
+        for X_batch, y_batch in _iter_batches(train_source, batch_size, rng):
+            model.partial_fit(X_batch, np.asarray(y_batch), classes=classes)
+
+        if validation_source is None:
+            print(f"Epoch {epoch+1}/{n_epochs}")
+            continue
+
+        total_loss, n_rows = 0.0, 0
+        for X_batch, y_batch in _iter_batches(validation_source, batch_size):
+            prob = model.predict_proba(X_batch)[:, 1]
+            total_loss += log_loss(y_batch, prob, labels=classes) * len(prob)
+            n_rows += len(prob)
+        val_loss = total_loss / n_rows
+        print(f"Epoch {epoch+1}/{n_epochs}: validation log loss {val_loss:.5f}")
+
+        if val_loss < best_loss - tol:
+            best_loss, stale = val_loss, 0
+            best_state = (model.coef_.copy(), model.intercept_.copy())
+        else:
+            stale += 1
+            if stale >= patience:
+                print(f"Early stopping after epoch {epoch+1}")
+                break
+
+    if best_state is not None:
+        model.coef_, model.intercept_ = best_state
+    return model
+
+def train_random_forest(X_train, y_train, n_estimators=100, random_state=42, n_jobs=-1):
     """
     Train random forest model
     
@@ -38,16 +137,95 @@ def train_random_forest(X_train, y_train, n_estimators=100, random_state=42):
         Number of trees in the forest
     random_state : int
         Random seed for reproducibility
+    n_jobs : int
+        Number of cores used to build trees (-1 uses all cores)
         
     Returns:
     --------
     sklearn.ensemble.RandomForestClassifier
         Trained random forest model
     """
-    rf_model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state)
+    rf_model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state,
+                                      n_jobs=n_jobs)
     rf_model.fit(X_train, y_train)
     return rf_model
 
+def train_random_forest_incremental(X_train, y_train, step=25, max_estimators=500, tol=1e-3,
+                                    random_state=42, n_jobs=-1, **rf_params):
+    """
+    Grow a random forest in increments until out-of-bag AUC stops improving
+
+    Trees are added step at a time with warm_start on all cores. After each
+    increment the out-of-bag AUC is computed; growth stops once the gain
+    over the previous increment falls below tol.
+
+    Parameters:
+    -----------
+    X_train : pandas.DataFrame
+        Training feature matrix
+    y_train : pandas.Series
+        Training target variable
+    step : int
+        Number of trees added per increment
+    max_estimators : int
+        Upper bound on the number of trees
+    tol : float
+        Minimum out-of-bag AUC gain to keep growing
+    random_state : int
+        Random seed for reproducibility
+    n_jobs : int
+        Number of cores used to build trees (-1 uses all cores)
+    **rf_params
+        Further RandomForestClassifier parameters (e.g. max_depth)
+
+    Returns:
+    --------
+    sklearn.ensemble.RandomForestClassifier
+        Trained random forest model
+    pandas.DataFrame
+        Per-increment trees, out-of-bag AUC, wall time and pickled size
+    """
+    import pickle
+    import time
+    import warnings
+    import pandas as pd
+    from sklearn.metrics import roc_auc_score
+
+    rf_model = RandomForestClassifier(n_estimators=0, warm_start=True, oob_score=True,
+                                      bootstrap=True, random_state=random_state,
+                                      n_jobs=n_jobs, **rf_params)
+    y = np.asarray(y_train)
+    history = []
+    size_bytes = 0
+    prev_auc = None
+    while rf_model.n_estimators < max_estimators:
+        n_before = rf_model.n_estimators
+        rf_model.n_estimators = min(n_before + step, max_estimators)
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            # Early increments leave some rows without OOB votes; they are skipped below
+            warnings.simplefilter('ignore', UserWarning)
+            rf_model.fit(X_train, y)
+        seconds = time.perf_counter() - start
+
+        # Rows never left out of bag yet have no OOB prediction
+        oob_prob = rf_model.oob_decision_function_[:, 1]
+        scored = ~np.isnan(oob_prob)
+        oob_auc = roc_auc_score(y[scored], oob_prob[scored])
+        # Pickle only the new trees and keep a running total
+        size_bytes += sum(len(pickle.dumps(tree)) for tree in rf_model.estimators_[n_before:])
+
+        history.append({'n_estimators': rf_model.n_estimators, 'oob_auc': oob_auc,
+                        'seconds': seconds, 'size_mb': size_bytes / 1e6})
+        print(f"{rf_model.n_estimators} trees: OOB AUC {oob_auc:.4f}, "
+              f"{seconds:.1f}s, {size_bytes / 1e6:.1f} MB")
+
+        if prev_auc is not None and oob_auc - prev_auc < tol:
+            break
+        prev_auc = oob_auc
+
+    return rf_model, pd.DataFrame(history)
+
 def get_feature_importance(model, feature_names):
     """
     Get feature importance from random forest model
@@ -73,8 +251,101 @@ def get_feature_importance(model, feature_names):
     
     return feature_importance
 
+def _predict_chunked(model, X, chunk_size, column=None, values=None):
+    """Class-1 probabilities in row chunks, optionally with one column replaced"""
+    import pandas as pd
+
+    scores = np.empty(X.shape[0], dtype=np.float64)
+    for start in range(0, X.shape[0], chunk_size):
+        stop = min(start + chunk_size, X.shape[0])
+        if isinstance(X, pd.DataFrame):
+            chunk = X.iloc[start:stop].copy()
+            if column is not None:
+                chunk.iloc[:, column] = values[start:stop]
+        else:
+            chunk = np.array(X[start:stop])
+            if column is not None:
+                chunk[:, column] = values[start:stop]
+        scores[start:stop] = model.predict_proba(chunk)[:, 1]
+    return scores
+
+def _permuted_auc(model, X, y, column, n_repeats, seed, chunk_size):
+    from sklearn.metrics import roc_auc_score
+
+    rng = np.random.default_rng(seed)
+    original = X.iloc[:, column].to_numpy() if hasattr(X, 'iloc') else np.asarray(X[:, column])
+    return [roc_auc_score(y, _predict_chunked(model, X, chunk_size, column, rng.permutation(original)))
+            for _ in range(n_repeats)]
+
+def get_permutation_importance(model, X, y, feature_names=None, n_samples=50000, n_repeats=3,
+                               chunk_size=100000, n_jobs=-1, random_state=42):
+    """
+    Get permutation importance for any model with predict_proba
+
+    Each feature is shuffled in turn on a subsample of the evaluation set
+    and the importance is the mean drop in AUC against the unpermuted
+    baseline, which is scored only once. Rows are scored in chunks, so only
+    one chunk is copied at a time, and features are evaluated in parallel
+    across a process pool.
+
+    Parameters:
+    -----------
+    model : object
+        Trained model with predict_proba method
+    X : pandas.DataFrame or numpy.ndarray
+        Evaluation feature matrix (e.g. the test set)
+    y : pandas.Series or numpy.ndarray
+        Evaluation target variable
+    feature_names : list, optional
+        List of feature names; defaults to the columns of X
+    n_samples : int, optional
+        Number of rows to subsample (None uses all rows)
+    n_repeats : int
+        Number of shuffles per feature
+    chunk_size : int
+        Rows scored per predict_proba call
+    n_jobs : int
+        Number of worker processes (-1 uses all cores)
+    random_state : int
+        Random seed for reproducibility
+
+    Returns:
+    --------
+    pandas.DataFrame
+        DataFrame with feature names and importance scores
+    """
+    import pandas as pd
+    from joblib import Parallel, delayed
+    from sklearn.metrics import roc_auc_score
+
+    if feature_names is None:
+        feature_names = list(X.columns) if isinstance(X, pd.DataFrame) else list(range(X.shape[1]))
+    y = np.asarray(y)
+
+    if n_samples is not None and n_samples < X.shape[0]:
+        # Sorted rows keep reads sequential for memory-mapped inputs
+        rng = np.random.default_rng(random_state)
+        rows = np.sort(rng.choice(X.shape[0], n_samples, replace=False))
+        X = X.iloc[rows] if isinstance(X, pd.DataFrame) else np.asarray(X[rows])
+        y = y[rows]
+
+    baseline = roc_auc_score(y, _predict_chunked(model, X, chunk_size))
+    seeds = np.random.SeedSequence(random_state).spawn(X.shape[1])
+    permuted = Parallel(n_jobs=n_jobs)(
+        delayed(_permuted_auc)(model, X, y, column, n_repeats, seeds[column], chunk_size)
+        for column in range(X.shape[1]))
+
+    feature_importance = pd.DataFrame({
+        'Feature': feature_names,
+        'Importance': [baseline - np.mean(scores) for scores in permuted]
+    }).sort_values('Importance', ascending=False)
+
+    return feature_importance
+
 def save_model(model, filepath):
     joblib.dump(model, filepath)
 
-def load_model(filepath):
-    return joblib.load(filepath)
\ No newline at end of file
+def load_model(filepath, mmap_mode=None):
+    # mmap_mode='r' memory-maps the numpy arrays of uncompressed joblib files;
+    # use ModelRegistry for cached loading by name and version
+    return joblib.load(filepath, mmap_mode=mmap_mode)
\ No newline at end of file
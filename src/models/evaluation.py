@@ -3,39 +3,219 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 
-def evaluate_model(model, X_test, y_test):
+class ScoreHistogram:
+    """
+    Fixed-bin histogram of predicted PDs per class
+
+    Accumulated chunk by chunk, it gives AUC, KS and Gini in O(n_bins)
+    without keeping the predictions. With fine bins the AUC differs from
+    the exact value only through ties inside a bin.
+
+    Parameters:
+    -----------
+    n_bins : int
+        Number of equal-width bins over [0, 1]
+    """
+
+    def __init__(self, n_bins=1000):
+        self.n_bins = n_bins
+        self.pos = np.zeros(n_bins, dtype=np.int64)
+        self.neg = np.zeros(n_bins, dtype=np.int64)
+
+    def update(self, y_true, y_prob):
+        """Add a chunk of labels and predicted probabilities"""
+        y_true = np.asarray(y_true)
+        bins = np.clip((np.asarray(y_prob) * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+        self.pos += np.bincount(bins[y_true == 1], minlength=self.n_bins)
+        self.neg += np.bincount(bins[y_true != 1], minlength=self.n_bins)
+        return self
+
+    def metrics(self):
+        """AUC, KS and Gini of the accumulated scores"""
+        return _histogram_metrics(self.pos, self.neg)
+
+def _histogram_metrics(pos, neg):
+    n_pos, n_neg = pos.sum(), neg.sum()
+    # Positives scored above each bin, plus half of the ties inside it
+    pos_above = n_pos - np.cumsum(pos)
+    auc = np.sum(neg * (pos_above + 0.5 * pos)) / (n_pos * n_neg)
+    ks = np.max(np.abs(np.cumsum(pos) / n_pos - np.cumsum(neg) / n_neg))
+    return {'auc': auc, 'ks': ks, 'gini': 2 * auc - 1}
+
+def _bootstrap_batch(cells, n_replicates, seed):
+    rng = np.random.default_rng(seed)
+    total = int(cells.sum())
+    n_bins = cells.shape[0] // 2
+    # Resampling rows with replacement = multinomial draw over the (bin, class) cells
+    draws = rng.multinomial(total, cells / total, size=n_replicates)
+    return [_histogram_metrics(draw[:n_bins], draw[n_bins:]) for draw in draws]
+
+def bootstrap_intervals(histogram, n_bootstrap=1000, ci=0.95, n_jobs=None, random_state=42,
+                        batch_size=50):
+    """
+    Bootstrap confidence intervals for AUC, KS and Gini from a score histogram
+
+    Each replicate resamples the holdout with replacement, which for binned
+    metrics is a multinomial draw over the (bin, class) cells, so a
+    replicate costs O(n_bins) regardless of holdout size. Replicates run in
+    parallel batches with independent seeds derived from random_state, so
+    results do not depend on n_jobs.
+
+    Parameters:
+    -----------
+    histogram : ScoreHistogram
+        Accumulated scores
+    n_bootstrap : int
+        Number of bootstrap replicates
+    ci : float
+        Confidence level
+    n_jobs : int, optional
+        Number of parallel workers
+    random_state : int
+        Random seed for reproducibility
+    batch_size : int
+        Replicates per parallel task
+
+    Returns:
+    --------
+    dict
+        (lower, upper) bounds per metric
+    """
+    cells = np.concatenate([histogram.pos, histogram.neg]).astype(np.float64)
+    sizes = [min(batch_size, n_bootstrap - start) for start in range(0, n_bootstrap, batch_size)]
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    batches = Parallel(n_jobs=n_jobs)(
+        delayed(_bootstrap_batch)(cells, size, seed) for size, seed in zip(sizes, seeds))
+    replicates = pd.DataFrame([row for batch in batches for row in batch])
+
+    alpha = (1 - ci) / 2
+    return {metric: tuple(replicates[metric].quantile([alpha, 1 - alpha]))
+            for metric in ['auc', 'ks', 'gini']}
+
+def evaluate_model(model, X_test, y_test, threshold=0.5, n_bins=None, n_bootstrap=0, ci=0.95,
+                   return_predictions=True, n_jobs=None, random_state=42):
     """
     Evaluate model performance
     
     Parameters:
     -----------
     model : object
-        Trained model with predict and predict_proba methods
+        Trained model with predict_proba method
     X_test : pandas.DataFrame
         Testing feature matrix
     y_test : pandas.Series
         Testing target variable
+    threshold : float
+        Predicted labels are 1 where the PD is above this threshold
+        (0.5 reproduces model.predict)
+    n_bins : int, optional
+        Compute AUC, KS and Gini from a histogram with this many bins
+        instead of exactly
+    n_bootstrap : int
+        Number of bootstrap replicates for confidence intervals (0 for none)
+    ci : float
+        Confidence level of the intervals
+    return_predictions : bool
+        Include the predicted labels and probabilities in the result
+    n_jobs : int, optional
+        Number of parallel workers for the bootstrap
+    random_state : int
+        Random seed for the bootstrap
         
     Returns:
     --------
     dict
         Dictionary with evaluation metrics
     """
-    y_pred = model.predict(X_test)
+    from sklearn.metrics import roc_curve
+
+    # Score once; labels come from the probabilities
     y_pred_prob = model.predict_proba(X_test)[:, 1]
+    y_pred = (y_pred_prob > threshold).astype(int)
+    y_true = np.asarray(y_test)
+
+    histogram = None
+    if n_bins or n_bootstrap:
+        histogram = ScoreHistogram(n_bins or 1000).update(y_true, y_pred_prob)
+    if n_bins:
+        ranking = histogram.metrics()
+    else:
+        fpr, tpr, _ = roc_curve(y_true, y_pred_prob)
+        auc = roc_auc_score(y_true, y_pred_prob)
+        ranking = {'auc': auc, 'ks': np.max(tpr - fpr), 'gini': 2 * auc - 1}
     
     metrics = {
-        'accuracy': (y_pred == y_test).mean(),
-        'auc': roc_auc_score(y_test, y_pred_prob),
-        'classification_report': classification_report(y_test, y_pred),
-        'confusion_matrix': confusion_matrix(y_test, y_pred),
-        'y_pred': y_pred,
-        'y_pred_prob': y_pred_prob
+        'accuracy': (y_pred == y_true).mean(),
+        'auc': ranking['auc'],
+        'ks': ranking['ks'],
+        'gini': ranking['gini'],
+        'classification_report': classification_report(y_true, y_pred),
+        'confusion_matrix': confusion_matrix(y_true, y_pred)
     }
+    if n_bootstrap:
+        intervals = bootstrap_intervals(histogram, n_bootstrap, ci, n_jobs, random_state)
+        for metric, bounds in intervals.items():
+            metrics[f'{metric}_ci'] = bounds
+    if return_predictions:
+        metrics['y_pred'] = y_pred
+        metrics['y_pred_prob'] = y_pred_prob
     
     return metrics
 
+def evaluate_model_streaming(model, chunks, threshold=0.5, n_bins=1000, n_bootstrap=0, ci=0.95,
+                             n_jobs=None, random_state=42):
+    """
+    Evaluate a model over a stream of holdout chunks
+
+    Each chunk is scored once and folded into a score histogram and a
+    confusion matrix, so memory does not grow with the holdout size.
+
+    Parameters:
+    -----------
+    model : object
+        Trained model with predict_proba method
+    chunks : iterable
+        (X, y) chunks of the holdout set
+    threshold : float
+        Predicted labels are 1 where the PD is above this threshold
+    n_bins : int
+        Number of histogram bins for AUC, KS and Gini
+    n_bootstrap : int
+        Number of bootstrap replicates for confidence intervals (0 for none)
+    ci : float
+        Confidence level of the intervals
+    n_jobs : int, optional
+        Number of parallel workers for the bootstrap
+    random_state : int
+        Random seed for the bootstrap
+
+    Returns:
+    --------
+    dict
+        Dictionary with evaluation metrics
+    """
+    histogram = ScoreHistogram(n_bins)
+    confusion = np.zeros((2, 2), dtype=np.int64)
+    for X_chunk, y_chunk in chunks:
+        y_true = np.asarray(y_chunk).astype(np.int64)
+        y_prob = model.predict_proba(X_chunk)[:, 1]
+        histogram.update(y_true, y_prob)
+        y_pred = (y_prob > threshold).astype(np.int64)
+        confusion += np.bincount(2 * y_true + y_pred, minlength=4).reshape(2, 2)
+
+    metrics = histogram.metrics()
+    metrics['accuracy'] = np.trace(confusion) / confusion.sum()
+    metrics['precision'] = confusion[1, 1] / max(confusion[:, 1].sum(), 1)
+    metrics['recall'] = confusion[1, 1] / max(confusion[1, :].sum(), 1)
+    metrics['confusion_matrix'] = confusion
+    if n_bootstrap:
+        intervals = bootstrap_intervals(histogram, n_bootstrap, ci, n_jobs, random_state)
+        for metric, bounds in intervals.items():
+            metrics[f'{metric}_ci'] = bounds
+    return metrics
+
 def plot_roc_curve(y_test, y_pred_prob, figsize=(10, 6)):
     """
     Plot ROC curve
@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+import pandas as pd
+
+from .scoring import ForestScorer
+
+class ModelRegistry:
+    """
+    Index of model artifacts by name and version with lazy, cached loading
+
+    Artifacts are indexed in registry.json under the registry root together
+    with their format and preprocessing fingerprint. Models are loaded only
+    when requested: joblib artifacts with mmap_mode so their numpy arrays
+    are memory-mapped instead of copied, compiled forests through
+    ForestScorer.load. Loaded models are kept in a bounded LRU cache, so
+    repeated calls never unpickle the same artifact twice.
+
+    Parameters:
+    -----------
+    root : str
+        Registry directory (artifacts registered here are saved under it)
+    max_cached : int
+        Maximum number of loaded models kept in memory
+    mmap_mode : str, optional
+        mmap mode for joblib artifacts ('r' by default, None to read fully)
+    """
+
+    def __init__(self, root='models', max_cached=4, mmap_mode='r'):
+        self.root = root
+        self.max_cached = max_cached
+        self.mmap_mode = mmap_mode
+        self.index_path = os.path.join(root, 'registry.json')
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-model locks, so concurrent misses on one model load it only once
+        self._loading = {}
+        self._index = self._read_index()
+
+    def _read_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as fh:
+            return json.load(fh)
+
+    def _write_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w') as fh:
+            json.dump(self._index, fh, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def _next_version(self, name):
+        versions = [int(v) for v in self._index.get(name, {})]
+        return max(versions, default=0) + 1
+
+    def _new_version(self, name, version):
+        if version is None:
+            return self._next_version(name)
+        if str(int(version)) in self._index.get(name, {}):
+            raise ValueError(f"Model {name} v{int(version)} is already registered")
+        return int(version)
+
+    def _add_entry(self, name, version, path, fmt, fingerprint, metadata):
+        version = self._new_version(name, version)
+        self._index.setdefault(name, {})[str(version)] = {
+            'path': os.path.relpath(path, self.root),
+            'format': fmt,
+            'fingerprint': fingerprint,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'metadata': metadata or {}
+        }
+        self._write_index()
+        return version
+
+    def register(self, name, model, version=None, fingerprint=None, metadata=None):
+        """
+        Save a model under the registry root and index it
+
+        Parameters:
+        -----------
+        name : str
+            Model name (e.g. 'logistic_regression')
+        model : object
+            Fitted model, scorer or ForestScorer
+        version : int, optional
+            Version number (defaults to the next free version); an
+            existing version raises ValueError
+        fingerprint : str, optional
+            Preprocessing fingerprint of the features the model expects
+        metadata : dict, optional
+            Extra JSON-serializable information
+
+        Returns:
+        --------
+        int
+            Registered version
+        """
+        version = self._new_version(name, version)
+        if isinstance(model, ForestScorer):
+            path = os.path.join(self.root, name, f"v{version}")
+            model.save(path)
+            fmt = 'forest'
+        else:
+            path = os.path.join(self.root, name, f"v{version}.pkl")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Uncompressed, so numpy arrays can be memory-mapped on load
+            joblib.dump(model, path)
+            fmt = 'joblib'
+        return self._add_entry(name, version, path, fmt, fingerprint, metadata)
+
+    def register_file(self, name, path, version=None, fingerprint=None, fmt='joblib',
+                      metadata=None):
+        """
+        Index an existing artifact (e.g. models/logistic_regression_model.pkl)
+
+        Parameters:
+        -----------
+        name : str
+            Model name
+        path : str
+            Path of the artifact
+        version : int, optional
+            Version number (defaults to the next free version); an
+            existing version raises ValueError
+        fingerprint : str, optional
+            Preprocessing fingerprint of the features the model expects
+        fmt : str
+            'joblib' for pickled models, 'forest' for a saved ForestScorer
+        metadata : dict, optional
+            Extra JSON-serializable information
+
+        Returns:
+        --------
+        int
+            Registered version
+        """
+        return self._add_entry(name, version, path, fmt, fingerprint, metadata)
+
+    def list_models(self):
+        """
+        List the indexed artifacts
+
+        Returns:
+        --------
+        pandas.DataFrame
+            One row per name and version
+        """
+        rows = [{'name': name, 'version': int(version), **entry}
+                for name, versions in self._index.items()
+                for version, entry in versions.items()]
+        return pd.DataFrame(rows)
+
+    def resolve(self, name, version=None):
+        """Index entry and version number of a model (latest version by default)"""
+        if name not in self._index:
+            raise KeyError(f"Model {name} is not registered")
+        versions = self._index[name]
+        version = max(int(v) for v in versions) if version is None else int(version)
+        if str(version) not in versions:
+            raise KeyError(f"Model {name} has no version {version}")
+        return versions[str(version)], version
+
+    def get(self, name, version=None, fingerprint=None):
+        """
+        Load a model, from the LRU cache when possible
+
+        Parameters:
+        -----------
+        name : str
+            Model name
+        version : int, optional
+            Version number (defaults to the latest)
+        fingerprint : str, optional
+            Expected preprocessing fingerprint; a mismatch raises ValueError
+
+        Returns:
+        --------
+        object
+            Loaded model
+        """
+        entry, version = self.resolve(name, version)
+        if fingerprint is not None and entry['fingerprint'] != fingerprint:
+            raise ValueError(f"Model {name} v{version} expects different preprocessing")
+
+        key = (name, version)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            # Another thread may have loaded the model while we waited
+            with self._lock:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    return self._cache[key]
+
+            path = os.path.join(self.root, entry['path'])
+            if entry['format'] == 'forest':
+                model = ForestScorer.load(path, mmap_mode=self.mmap_mode)
+            else:
+                model = joblib.load(path, mmap_mode=self.mmap_mode)
+
+            with self._lock:
+                self._cache[key] = model
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cached:
+                    self._cache.popitem(last=False)
+                self._loading.pop(key, None)
+        return model
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
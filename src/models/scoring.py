@@ -0,0 +1,271 @@
+import joblib
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+def _scaler_params(scaler):
+    """Column names, means and scales of a StreamingScaler or fitted StandardScaler"""
+    if hasattr(scaler, 'scaler_'):
+        return list(scaler.columns), scaler.scaler_.mean_, scaler.scaler_.scale_
+    return list(scaler.feature_names_in_), scaler.mean_, scaler.scale_
+
+class LogisticScorer:
+    """
+    Compact PD scorer for a logistic model with the scaling folded in
+
+    Holds one float32 weight vector and an intercept over the unscaled
+    feature layout, so a block of rows is scored with a single matmul and a
+    sigmoid, without sklearn's input validation or a two-column output.
+
+    Parameters:
+    -----------
+    weights : numpy.ndarray
+        Weights over feature_names (unscaled features)
+    intercept : float
+        Intercept
+    feature_names : list
+        Feature layout the weights refer to
+    encoder : CategoricalEncoder, optional
+        Encoder used to score raw (unencoded) DataFrames
+    chunk_size : int
+        Rows scored per block
+    """
+
+    def __init__(self, weights, intercept, feature_names, encoder=None, chunk_size=262144):
+        self.weights = np.ascontiguousarray(weights, dtype=np.float32)
+        self.intercept = np.float32(intercept)
+        self.feature_names = list(feature_names)
+        self.encoder = encoder
+        self.chunk_size = chunk_size
+
+    def _score_frame(self, df):
+        if self.encoder is not None and all(col in df.columns for col in self.encoder.columns):
+            # Raw frame: numeric block plus uint8 indicators, no dense dummy frame
+            n_numeric = len(self.encoder.numeric_columns_)
+            numeric = df[self.encoder.numeric_columns_].to_numpy(dtype=np.float32)
+            indicators = self.encoder.transform(df, output='uint8')
+            z = numeric @ self.weights[:n_numeric] + indicators @ self.weights[n_numeric:]
+            return expit(z + self.intercept)
+        return self.predict_pd(df[self.feature_names].to_numpy(dtype=np.float32))
+
+    def predict_pd(self, X):
+        """
+        Probability of default for each row
+
+        Parameters:
+        -----------
+        X : numpy.ndarray or pandas.DataFrame
+            Unscaled features in feature_names order, an encoded DataFrame,
+            or a raw DataFrame if an encoder was exported
+
+        Returns:
+        --------
+        numpy.ndarray
+            Probability of default (float32)
+        """
+        if isinstance(X, pd.DataFrame):
+            return self._score_frame(X)
+
+        pd_values = np.empty(X.shape[0], dtype=np.float32)
+        for start in range(0, X.shape[0], self.chunk_size):
+            block = np.asarray(X[start:start + self.chunk_size], dtype=np.float32)
+            pd_values[start:start + block.shape[0]] = expit(block @ self.weights + self.intercept)
+        return pd_values
+
+    def predict_proba(self, X):
+        pd_values = self.predict_pd(X)
+        return np.column_stack([1 - pd_values, pd_values])
+
+    def save(self, filepath):
+        joblib.dump(self, filepath)
+
+    @staticmethod
+    def load(filepath):
+        return joblib.load(filepath)
+
+def export_logistic_scorer(model, scaler=None, encoder=None, feature_names=None):
+    """
+    Export a fitted logistic model into a LogisticScorer
+
+    The standardization of the scaled columns is folded into the weights
+    (w / scale) and the intercept (b - sum(w * mean / scale)), so the scorer
+    takes unscaled features.
+
+    Parameters:
+    -----------
+    model : sklearn.linear_model.LogisticRegression or SGDClassifier
+        Fitted binary logistic model
+    scaler : StreamingScaler or sklearn.preprocessing.StandardScaler, optional
+        Scaler applied to the model's inputs
+    encoder : CategoricalEncoder, optional
+        Encoder that produced the model's feature layout
+    feature_names : list, optional
+        Feature layout of the model; defaults to the encoder's layout or the
+        model's feature_names_in_
+
+    Returns:
+    --------
+    LogisticScorer
+        Compact scorer
+    """
+    if feature_names is None:
+        if encoder is not None:
+            feature_names = encoder.feature_names_
+        else:
+            feature_names = list(model.feature_names_in_)
+    feature_names = list(feature_names)
+
+    weights = model.coef_.ravel().astype(np.float64)
+    intercept = float(model.intercept_[0])
+    if scaler is not None:
+        position = {name: i for i, name in enumerate(feature_names)}
+        columns, means, scales = _scaler_params(scaler)
+        idx = np.array([position[col] for col in columns])
+        folded = weights[idx] / scales
+        intercept -= float(np.dot(folded, means))
+        weights[idx] = folded
+
+    return LogisticScorer(weights, intercept, feature_names, encoder=encoder)
+
+class ForestScorer:
+    """
+    Tree ensemble flattened into contiguous node arrays
+
+    All trees share one set of node arrays (feature index, threshold, left
+    and right child, class-1 probability), addressed by global node id.
+    Leaves point to themselves, so a batch of rows descends every tree at
+    once in at most max_depth vectorized steps. The arrays are saved as .npy files
+    and memory-mapped on load.
+
+    Parameters:
+    -----------
+    arrays : dict
+        Node arrays: feature, threshold, left, right, value, missing_left
+        and roots (root node id of each tree)
+    max_depth : int
+        Depth of the deepest tree
+    feature_names : list, optional
+        Feature layout of the model
+    batch_size : int
+        Rows descended per batch
+    """
+
+    _ARRAYS = ['feature', 'threshold', 'left', 'right', 'value', 'missing_left', 'roots']
+
+    def __init__(self, arrays, max_depth, feature_names=None, batch_size=4096):
+        for name in self._ARRAYS:
+            setattr(self, name, arrays[name])
+        self.max_depth = int(max_depth)
+        self.feature_names = None if feature_names is None else list(feature_names)
+        self.batch_size = batch_size
+
+    def predict_pd(self, X):
+        """
+        Probability of default, matching the forest's predict_proba[:, 1]
+
+        Parameters:
+        -----------
+        X : numpy.ndarray or pandas.DataFrame
+            Features in the model's layout
+
+        Returns:
+        --------
+        numpy.ndarray
+            Probability of default
+        """
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names is not None:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+        n_trees = self.roots.shape[0]
+        pd_values = np.empty(X.shape[0], dtype=np.float64)
+
+        for start in range(0, X.shape[0], self.batch_size):
+            # Trees compare float32 inputs against float64 thresholds, as sklearn does
+            block = np.asarray(X[start:start + self.batch_size], dtype=np.float32)
+            n_rows = block.shape[0]
+            # One (row, tree) path per slot; only paths not yet at a leaf are advanced
+            nodes = np.tile(self.roots, n_rows)
+            path_rows = np.repeat(np.arange(n_rows), n_trees)
+            active = np.arange(nodes.shape[0])
+            for _ in range(self.max_depth):
+                current = nodes[active]
+                values = block[path_rows[active], self.feature[current]]
+                go_left = values <= self.threshold[current]
+                go_left |= np.isnan(values) & self.missing_left[current]
+                current = np.where(go_left, self.left[current], self.right[current])
+                nodes[active] = current
+                active = active[self.left[current] != current]
+                if active.size == 0:
+                    break
+            pd_values[start:start + n_rows] = self.value[nodes].reshape(n_rows, n_trees).mean(axis=1)
+        return pd_values
+
+    def predict_proba(self, X):
+        pd_values = self.predict_pd(X)
+        return np.column_stack([1 - pd_values, pd_values])
+
+    def save(self, path):
+        """Save the node arrays as .npy files plus a JSON sidecar in a directory"""
+        import json
+        import os
+
+        os.makedirs(path, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, 'forest.json'), 'w') as fh:
+            json.dump({'max_depth': self.max_depth, 'feature_names': self.feature_names}, fh)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Open a saved forest, memory-mapping the node arrays by default"""
+        import json
+        import os
+
+        with open(os.path.join(path, 'forest.json')) as fh:
+            meta = json.load(fh)
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+                  for name in cls._ARRAYS}
+        return cls(arrays, meta['max_depth'], meta['feature_names'])
+
+def compile_forest(model, feature_names=None):
+    """
+    Flatten a fitted random forest (or single decision tree) into a ForestScorer
+
+    Parameters:
+    -----------
+    model : sklearn.ensemble.RandomForestClassifier or DecisionTreeClassifier
+        Fitted binary classifier
+    feature_names : list, optional
+        Feature layout; defaults to the model's feature_names_in_
+
+    Returns:
+    --------
+    ForestScorer
+        Flattened scorer
+    """
+    trees = [est.tree_ for est in getattr(model, 'estimators_', [model])]
+    if feature_names is None and hasattr(model, 'feature_names_in_'):
+        feature_names = list(model.feature_names_in_)
+
+    parts = {name: [] for name in ForestScorer._ARRAYS if name != 'roots'}
+    roots = []
+    offset = 0
+    for tree in trees:
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        counts = tree.value[:, 0, :]
+        parts['feature'].append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+        parts['threshold'].append(np.where(is_leaf, np.inf, tree.threshold))
+        parts['left'].append((np.where(is_leaf, node_ids, tree.children_left) + offset).astype(np.int32))
+        parts['right'].append((np.where(is_leaf, node_ids, tree.children_right) + offset).astype(np.int32))
+        parts['value'].append(counts[:, 1] / counts.sum(axis=1))
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8))
+        parts['missing_left'].append(np.asarray(missing_left, dtype=bool) & ~is_leaf)
+        roots.append(offset)
+        offset += tree.node_count
+
+    arrays = {name: np.concatenate(values) for name, values in parts.items()}
+    arrays['roots'] = np.array(roots, dtype=np.int32)
+    max_depth = max(tree.max_depth for tree in trees)
+    return ForestScorer(arrays, max_depth, feature_names)
@@ -0,0 +1,179 @@
+import json
+import math
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+
+from ..data.feature_store import load_features, save_features
+
+ESTIMATORS = {
+    'logistic_regression': LogisticRegression,
+    'random_forest': RandomForestClassifier
+}
+
+def build_cv_folds(X, y, cache_dir, n_splits=3, random_state=42):
+    """
+    Build stratified CV folds once and cache them as memory-mapped matrices
+
+    The folds are keyed on a hash of the data and split settings, so later
+    tuning runs on the same data reuse them. Each fold's train and
+    validation matrices are stored in the feature store format, so every
+    worker process memory-maps the same physical copy.
+
+    Parameters:
+    -----------
+    X : pandas.DataFrame or numpy.ndarray
+        Preprocessed feature matrix
+    y : pandas.Series or numpy.ndarray
+        Target variable
+    cache_dir : str
+        Directory for cached folds
+    n_splits : int
+        Number of folds
+    random_state : int
+        Random seed for reproducibility
+
+    Returns:
+    --------
+    list
+        Directories of the cached folds
+    """
+    key = joblib.hash((X, y, n_splits, random_state))
+    root = os.path.join(cache_dir, key)
+    fold_dirs = [os.path.join(root, f"fold{k}") for k in range(n_splits)]
+    if os.path.exists(os.path.join(root, 'folds.json')):
+        print(f"Reusing cached folds in {root}")
+        return fold_dirs
+
+    X_values = np.asarray(X, dtype=np.float32)
+    y_values = np.asarray(y)
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for fold_dir, (train_idx, val_idx) in zip(fold_dirs, splitter.split(X_values, y_values)):
+        save_features(X_values[train_idx], os.path.join(fold_dir, 'X_train'))
+        save_features(y_values[train_idx], os.path.join(fold_dir, 'y_train'), dtype=np.int8)
+        save_features(X_values[val_idx], os.path.join(fold_dir, 'X_val'))
+        save_features(y_values[val_idx], os.path.join(fold_dir, 'y_val'), dtype=np.int8)
+
+    with open(os.path.join(root, 'folds.json'), 'w') as fh:
+        json.dump({'n_splits': n_splits, 'random_state': random_state,
+                   'n_rows': int(X_values.shape[0])}, fh)
+    print(f"Cached {n_splits} folds in {root}")
+    return fold_dirs
+
+def _evaluate_fold(estimator, params, fold_dir, budget, random_state):
+    X_train = load_features(os.path.join(fold_dir, 'X_train'))
+    y_train = load_features(os.path.join(fold_dir, 'y_train'))
+    X_val = load_features(os.path.join(fold_dir, 'X_val'))
+    y_val = load_features(os.path.join(fold_dir, 'y_val'))
+
+    if budget < 1.0:
+        # Same subsample for every candidate of a rung, sorted for sequential reads
+        rng = np.random.default_rng(random_state)
+        n_rows = max(int(X_train.shape[0] * budget), 1)
+        rows = np.sort(rng.choice(X_train.shape[0], n_rows, replace=False))
+        X_train, y_train = X_train[rows], y_train[rows]
+
+    model = ESTIMATORS[estimator](**params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    seconds = time.perf_counter() - start
+    auc = roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+    return auc, seconds
+
+def tune_model(X, y, estimator='random_forest', param_grid=None, n_iter=None, cache_dir='models/cv_cache',
+               n_splits=3, min_budget=0.1, eta=3, n_jobs=-1, random_state=42):
+    """
+    Hyperparameter search with cached CV folds and successive halving
+
+    Candidates from a grid (or a random sample of it) are first evaluated on
+    a min_budget fraction of each training fold. The best 1/eta of them
+    move on to an eta times larger budget until the full data is used; a
+    single remaining candidate goes straight to the full budget, so the
+    winner is always scored on all training rows. Every (candidate, fold)
+    fit runs in a process pool against the cached, memory-mapped folds.
+    The best parameters are refitted on all of X.
+
+    Parameters:
+    -----------
+    X : pandas.DataFrame or numpy.ndarray
+        Preprocessed feature matrix
+    y : pandas.Series or numpy.ndarray
+        Target variable
+    estimator : str
+        'logistic_regression' or 'random_forest'
+    param_grid : dict
+        Parameter grid (lists of values, or distributions with n_iter)
+    n_iter : int, optional
+        Number of random candidates; None evaluates the full grid
+    cache_dir : str
+        Directory for cached folds
+    n_splits : int
+        Number of CV folds
+    min_budget : float
+        Fraction of training rows used in the first rung
+    eta : int
+        Halving rate: keep 1/eta of the candidates, multiply budget by eta
+    n_jobs : int
+        Number of worker processes (-1 uses all cores)
+    random_state : int
+        Random seed for reproducibility
+
+    Returns:
+    --------
+    object
+        Best model refitted on X, y
+    pandas.DataFrame
+        Candidate parameters, rung, budget, mean/std AUC and fit time
+    """
+    param_grid = param_grid or {}
+    if n_iter is None:
+        candidates = list(ParameterGrid(param_grid))
+    else:
+        candidates = list(ParameterSampler(param_grid, n_iter, random_state=random_state))
+    fold_dirs = build_cv_folds(X, y, cache_dir, n_splits, random_state)
+
+    rows = []
+    budget = min(min_budget, 1.0)
+    rung = 0
+    while True:
+        start = time.perf_counter()
+        tasks = [(i, fold_dir) for i in range(len(candidates)) for fold_dir in fold_dirs]
+        scores = Parallel(n_jobs=n_jobs)(
+            delayed(_evaluate_fold)(estimator, candidates[i], fold_dir, budget, random_state)
+            for i, fold_dir in tasks)
+
+        rung_rows = []
+        for i, params in enumerate(candidates):
+            fold_scores = scores[i * len(fold_dirs):(i + 1) * len(fold_dirs)]
+            aucs = [auc for auc, _ in fold_scores]
+            rung_rows.append({'rung': rung, 'budget': budget, 'params': params,
+                              'mean_auc': np.mean(aucs), 'std_auc': np.std(aucs),
+                              'fit_seconds': sum(seconds for _, seconds in fold_scores)})
+        rows.extend(rung_rows)
+        print(f"Rung {rung}: {len(candidates)} candidates on {budget*100:.0f}% of rows "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        if budget >= 1.0:
+            break
+        n_keep = math.ceil(len(candidates) / eta)
+        ranked = sorted(range(len(candidates)), key=lambda i: -rung_rows[i]['mean_auc'])
+        candidates = [candidates[i] for i in ranked[:n_keep]]
+        # A lone survivor has nothing left to compete with: confirm it on the full budget
+        budget = 1.0 if n_keep == 1 else min(budget * eta, 1.0)
+        rung += 1
+
+    results = pd.DataFrame(rows).sort_values(['rung', 'mean_auc'], ascending=[False, False])
+    best_params = results.iloc[0]['params']
+    print(f"Best parameters: {best_params} (AUC {results.iloc[0]['mean_auc']:.4f})")
+
+    best_model = ESTIMATORS[estimator](**best_params)
+    best_model.fit(X, y)
+    return best_model, results.reset_index(drop=True)
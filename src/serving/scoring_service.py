@@ -0,0 +1,352 @@
+import asyncio
+import json
+import numbers
+import time
+from collections import Counter, deque
+
+import numpy as np
+import pandas as pd
+
+from ..basel.risk_weights import assign_risk_weights, calculate_pd, calculate_rwa, estimate_lgd
+
+def score_loans(model, loans_df, feature_columns=None, preprocess=None):
+    """
+    Score a batch of loan applications in one vectorized pass
+
+    Parameters:
+    -----------
+    model : object
+        Trained model with predict_proba, or a compiled scorer with predict_pd
+    loans_df : pandas.DataFrame
+        Loan applications; EAD is taken from an 'EAD' column if present,
+        otherwise (or where it is missing) from 'loan_amnt'
+    feature_columns : list, optional
+        Model feature columns selected from loans_df
+    preprocess : callable, optional
+        Function mapping loans_df to the model's feature frame (used instead
+        of feature_columns, e.g. imputer/encoder/scaler transforms)
+
+    Returns:
+    --------
+    pandas.DataFrame
+        PD, LGD, EAD, EL, RiskWeight and RWA per loan
+    """
+    if preprocess is not None:
+        features = preprocess(loans_df)
+    elif feature_columns is not None:
+        features = loans_df[feature_columns]
+    else:
+        features = loans_df
+
+    pd_values = np.asarray(calculate_pd(model, features), dtype=np.float64)
+    lgd = np.broadcast_to(np.asarray(estimate_lgd(features), dtype=np.float64), pd_values.shape)
+    if 'EAD' in loans_df.columns and 'loan_amnt' in loans_df.columns:
+        # Batches can mix loans with and without an explicit EAD
+        ead = loans_df['EAD'].fillna(loans_df['loan_amnt'])
+    else:
+        ead = loans_df['EAD'] if 'EAD' in loans_df.columns else loans_df['loan_amnt']
+    ead = ead.to_numpy(dtype=np.float64)
+    risk_weight = assign_risk_weights(pd_values)
+
+    return pd.DataFrame({
+        'PD': pd_values,
+        'LGD': lgd,
+        'EAD': ead,
+        'EL': pd_values * lgd * ead,
+        'RiskWeight': risk_weight,
+        'RWA': calculate_rwa(ead, risk_weight)
+    })
+
+def _is_loan_list(records):
+    return isinstance(records, list) and len(records) > 0 and \
+        all(isinstance(record, dict) for record in records)
+
+def _check_loans(records, numeric_columns):
+    """Error message for the first loan missing a required column or holding a non-numeric value"""
+    for i, record in enumerate(records):
+        exposure_col = 'EAD' if 'EAD' in record else 'loan_amnt'
+        for col in [*numeric_columns, exposure_col]:
+            value = record.get(col)
+            if value is None:
+                return f"Loan {i} is missing {col}"
+            if isinstance(value, bool) or not isinstance(value, numbers.Real):
+                return f"Loan {i} has a non-numeric {col}: {value!r}"
+    return None
+
+class ServiceMetrics:
+    """
+    Request latency and batch-size statistics of the scoring service
+
+    Parameters:
+    -----------
+    window : int
+        Number of most recent request latencies kept for percentiles
+    """
+
+    def __init__(self, window=10000):
+        self.latencies_ms = deque(maxlen=window)
+        self.batch_sizes = Counter()
+        self.requests = 0
+        self.loans = 0
+
+    def record_batch(self, n_loans):
+        self.batch_sizes[n_loans] += 1
+        self.loans += n_loans
+
+    def record_request(self, latency_ms):
+        self.latencies_ms.append(latency_ms)
+        self.requests += 1
+
+    def summary(self):
+        """Latency percentiles and a power-of-two batch-size histogram"""
+        latencies = np.array(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        histogram = Counter()
+        for size, count in self.batch_sizes.items():
+            histogram[f"<={1 << int(np.ceil(np.log2(size)))}"] += count
+        n_batches = sum(self.batch_sizes.values())
+        return {
+            'requests': self.requests,
+            'loans': self.loans,
+            'batches': n_batches,
+            'mean_batch_size': self.loans / n_batches if n_batches else 0.0,
+            'latency_ms': {'p50': p50, 'p90': p90, 'p99': p99, 'max': float(latencies.max())},
+            'batch_size_histogram': dict(sorted(histogram.items(), key=lambda kv: int(kv[0][2:])))
+        }
+
+class MicroBatcher:
+    """
+    Gathers concurrent scoring requests into micro-batches
+
+    A batch is closed once it holds max_batch loans or max_wait_ms has
+    passed since its first request, then scored with one vectorized call in
+    a worker thread. While a batch is being scored new requests queue up,
+    so batches grow with load. If a batch fails, its requests are rescored
+    one by one so only the offending request gets the error.
+
+    Parameters:
+    -----------
+    score_fn : callable
+        Function mapping a DataFrame of loans to a DataFrame of results
+    max_batch : int
+        Maximum number of loans per batch
+    max_wait_ms : float
+        Maximum time the first request of a batch waits for company
+    metrics : ServiceMetrics, optional
+        Metrics collector
+    """
+
+    def __init__(self, score_fn, max_batch=512, max_wait_ms=5.0, metrics=None):
+        self.score_fn = score_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.metrics = metrics or ServiceMetrics()
+        self._queue = asyncio.Queue()
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, records):
+        """Queue a list of loan records and wait for their results"""
+        if not _is_loan_list(records):
+            raise TypeError("records must be a non-empty list of loan objects")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await self._score_batch(loop, batch)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # A failing batch only fails its own requests, never the loop
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    async def _score_batch(self, loop, batch):
+        n_loans = len(batch[0][0])
+        deadline = loop.time() + self.max_wait
+        while n_loans < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.append(item)
+            n_loans += len(item[0])
+
+        records = [record for item_records, _ in batch for record in item_records]
+        self.metrics.record_batch(len(records))
+        try:
+            results = await loop.run_in_executor(None, self.score_fn, pd.DataFrame(records))
+        except Exception:
+            if len(batch) == 1:
+                raise
+            await self._score_each(loop, batch)
+            return
+
+        rows = results.to_dict(orient='records')
+        start = 0
+        for item_records, future in batch:
+            if not future.done():
+                future.set_result(rows[start:start + len(item_records)])
+            start += len(item_records)
+
+    async def _score_each(self, loop, batch):
+        for item_records, future in batch:
+            try:
+                results = await loop.run_in_executor(None, self.score_fn, pd.DataFrame(item_records))
+            except Exception as exc:
+                if not future.done():
+                    future.set_exception(exc)
+            else:
+                if not future.done():
+                    future.set_result(results.to_dict(orient='records'))
+
+class ScoringService:
+    """
+    Minimal asyncio HTTP service for online PD, LGD, EAD, RW and RWA scoring
+
+    Endpoints:
+        POST /score    body: one loan object, a list of loans, or {"loans": [...]};
+                       loans missing a feature column or loan_amnt/EAD, or
+                       with non-numeric values there, are rejected with 400
+        GET  /metrics  latency percentiles and batch-size histogram
+        GET  /health   liveness check
+
+    Parameters:
+    -----------
+    model : object
+        Trained model or compiled scorer
+    feature_columns : list, optional
+        Model feature columns selected from each batch
+    preprocess : callable, optional
+        Function mapping a batch DataFrame to the model's features
+    max_batch : int
+        Maximum number of loans per micro-batch
+    max_wait_ms : float
+        Maximum wait before a partial micro-batch is scored
+    """
+
+    def __init__(self, model, feature_columns=None, preprocess=None, max_batch=512,
+                 max_wait_ms=5.0):
+        if feature_columns is None and preprocess is None:
+            feature_columns = getattr(model, 'feature_names', None)
+            if feature_columns is None and hasattr(model, 'feature_names_in_'):
+                feature_columns = list(model.feature_names_in_)
+        # Columns checked before queuing, so a malformed request cannot fail
+        # the micro-batch it would share with other clients
+        self.numeric_columns = list(feature_columns or []) if preprocess is None else []
+        self.metrics = ServiceMetrics()
+        self.batcher = MicroBatcher(
+            lambda loans_df: score_loans(model, loans_df, feature_columns, preprocess),
+            max_batch=max_batch, max_wait_ms=max_wait_ms, metrics=self.metrics)
+        self._server = None
+
+    async def start(self, host='127.0.0.1', port=8050):
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.batcher.stop()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self._route(method, path, body)
+                data = json.dumps(payload, default=float).encode()
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        if method == 'GET' and path == '/health':
+            return '200 OK', {'status': 'ok'}
+        if method == 'GET' and path == '/metrics':
+            return '200 OK', self.metrics.summary()
+        if method != 'POST' or path != '/score':
+            return '404 Not Found', {'error': f"No route for {method} {path}"}
+
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError as exc:
+            return '400 Bad Request', {'error': str(exc)}
+        if isinstance(payload, dict):
+            payload = payload.get('loans', [payload])
+        if not _is_loan_list(payload):
+            return '400 Bad Request', {'error': 'Expected a loan object, a non-empty list of loan '
+                                                'objects or {"loans": [...]}'}
+        error = _check_loans(payload, self.numeric_columns)
+        if error is not None:
+            return '400 Bad Request', {'error': error}
+
+        try:
+            results = await self.batcher.submit(payload)
+        except Exception as exc:
+            return '422 Unprocessable Entity', {'error': str(exc)}
+        self.metrics.record_request((time.perf_counter() - start) * 1000)
+        return '200 OK', {'results': results}
+
+def run_service(model, host='127.0.0.1', port=8050, **kwargs):
+    """
+    Run the scoring service until interrupted
+
+    Parameters:
+    -----------
+    model : object
+        Trained model or compiled scorer
+    host : str
+        Interface to listen on
+    port : int
+        Port to listen on
+    **kwargs
+        ScoringService options (feature_columns, preprocess, max_batch, max_wait_ms)
+    """
+    async def main():
+        service = ScoringService(model, **kwargs)
+        server = await service.start(host, port)
+        print(f"Scoring service listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
@@ -213,4 +213,66 @@ def create_risk_metrics_table(loans_df, pd_col='PD', el_col='EL', rwa_col='RWA',
         'Weighted Avg PD': f"{weighted_avg_pd:.2f}%"
     }])
     
-    return metrics, risk_summary
\ No newline at end of file
+    return metrics, risk_summary
+
+def compute_scenario_metrics(risk_data, scenario='normal', tier1_ratio=0.06, total_ratio=0.08,
+                             conservation_buffer=0.025):
+    """
+    Compute the dashboard's risk and capital figures for a stress scenario
+
+    This is the computation behind the dashboard callback, kept free of Dash
+    so it can be reused and benchmarked.
+
+    Parameters:
+    -----------
+    risk_data : pandas.DataFrame
+        Basel risk calculations with PD, LGD, EAD, EL, RWA and RiskWeight columns
+    scenario : str
+        'normal' or a stress scenario ('mild', 'moderate', 'severe')
+    tier1_ratio : float
+        Tier 1 capital ratio
+    total_ratio : float
+        Total capital ratio
+    conservation_buffer : float
+        Capital conservation buffer
+
+    Returns:
+    --------
+    dict
+        Scenario PD, EL, RWA and risk weights, the risk metrics table and
+        risk summary, and the minimum capital amounts
+    """
+    from ..basel.risk_weights import assign_risk_weights
+    from ..basel.stress_testing import apply_stress_scenario
+
+    if scenario == 'normal':
+        current_pd = risk_data['PD']
+        current_el = risk_data['EL']
+        current_rwa = risk_data['RWA']
+        current_risk_weight = risk_data['RiskWeight']
+    else:
+        current_pd = apply_stress_scenario(risk_data['PD'], scenario=scenario)
+        current_el = current_pd * risk_data['LGD'] * risk_data['EAD']
+        current_risk_weight = assign_risk_weights(current_pd)
+        current_rwa = risk_data['EAD'] * current_risk_weight
+
+    total_rwa = current_rwa.sum()
+
+    temp_df = risk_data.copy()
+    temp_df['PD'] = current_pd
+    temp_df['EL'] = current_el
+    temp_df['RWA'] = current_rwa
+    temp_df['RiskWeight'] = current_risk_weight
+    metrics_df, risk_summary = create_risk_metrics_table(temp_df)
+
+    return {
+        'pd': current_pd,
+        'el': current_el,
+        'rwa': current_rwa,
+        'risk_weight': current_risk_weight,
+        'metrics': metrics_df,
+        'risk_summary': risk_summary,
+        'min_tier1_capital': total_rwa * tier1_ratio,
+        'min_total_capital': total_rwa * total_ratio,
+        'min_capital_with_buffer': total_rwa * (total_ratio + conservation_buffer)
+    }
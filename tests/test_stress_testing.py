@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.basel.risk_weights import RISK_WEIGHT_THRESHOLDS, RISK_WEIGHTS, assign_risk_weights
+from src.basel.stress_testing import (_exposure_profile, _stressed_rwa, apply_stress_scenario,
+                                      reverse_stress_test)
+
+BUCKETS = [
+    (RISK_WEIGHT_THRESHOLDS, RISK_WEIGHTS),
+    # Top bound at 1.0: capped PDs never exceed it
+    ((0.05, 0.1, 0.3, 1.0), (0.5, 0.75, 1.0, 1.5, 2.5))
+]
+
+@pytest.fixture
+def portfolio():
+    rng = np.random.default_rng(0)
+    base_pd = rng.beta(1, 20, 5000)
+    ead = rng.uniform(1000, 50000, 5000)
+    return base_pd, ead
+
+@pytest.mark.parametrize('thresholds, weights', BUCKETS)
+def test_prefix_sum_rwa_matches_full_recomputation(portfolio, thresholds, weights):
+    base_pd, ead = portfolio
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    multipliers = np.array([1.0, 1.7, 3.3, 10.0, 50.0, 500.0])
+
+    rwa = _stressed_rwa(_exposure_profile(base_pd, ead), multipliers, thresholds, weights)
+    full_rwa = [np.dot(assign_risk_weights(apply_stress_scenario(base_pd, m), thresholds, weights), ead)
+                for m in multipliers]
+    np.testing.assert_allclose(rwa, full_rwa)
+
+@pytest.mark.parametrize('thresholds, weights', BUCKETS)
+def test_reverse_stress_rwa_matches_full_recomputation(portfolio, thresholds, weights):
+    base_pd, ead = portfolio
+    base_rwa = np.dot(assign_risk_weights(base_pd, thresholds, weights), ead)
+    results = reverse_stress_test(base_pd, ead, 0.15 * base_rwa, thresholds=thresholds,
+                                  weights=weights)
+
+    assert 1.0 < results['multiplier'] < np.inf
+    full_rwa = np.dot(assign_risk_weights(apply_stress_scenario(base_pd, results['multiplier']),
+                                          thresholds, weights), ead)
+    assert np.isclose(results['rwa'], full_rwa)